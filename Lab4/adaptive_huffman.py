@@ -0,0 +1,181 @@
+from collections.abc import Iterable, Iterator
+
+from bitio import BitWriter
+
+EOF_SYMBOL = 256
+ALPHABET = 257
+LITERAL_BITS = 9
+
+
+# Дерево FGK над байтами. Узлы пронумерованы так, что веса не убывают
+# с номером (свойство братства); корень имеет наибольший номер
+class AdaptiveHuffmanTree:
+    def __init__(self) -> None:
+        self.max_number = 2 * ALPHABET
+        self.parent = [-1]
+        self.left = [-1]
+        self.right = [-1]
+        self.weight = [0]
+        self.symbol = [-1]
+        self.number = [self.max_number]
+        self.order = [-1] * (self.max_number + 1)
+        self.order[self.max_number] = 0
+        self.leaf = [-1] * ALPHABET
+        self.root = 0
+        self.nyt = 0
+
+    def _new_node(self, parent: int, symbol: int, number: int) -> int:
+        node = len(self.parent)
+        self.parent.append(parent)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.weight.append(0)
+        self.symbol.append(symbol)
+        self.number.append(number)
+        self.order[number] = node
+        return node
+
+    def code(self, symbol: int) -> tuple[int, int, bool]:
+        # Код листа символа (или NYT для нового символа) от корня к листу
+        node = self.leaf[symbol]
+        new = node < 0
+        if new:
+            node = self.nyt
+        code = length = 0
+        while node != self.root:
+            p = self.parent[node]
+            if self.right[p] == node:
+                code |= 1 << length
+            length += 1
+            node = p
+        return code, length, new
+
+    def _swap(self, a: int, b: int) -> None:
+        pa, pb = self.parent[a], self.parent[b]
+        if pa == pb:
+            self.left[pa], self.right[pa] = self.right[pa], self.left[pa]
+        else:
+            if self.left[pa] == a:
+                self.left[pa] = b
+            else:
+                self.right[pa] = b
+            if self.left[pb] == b:
+                self.left[pb] = a
+            else:
+                self.right[pb] = a
+            self.parent[a], self.parent[b] = pb, pa
+        na, nb = self.number[a], self.number[b]
+        self.number[a], self.number[b] = nb, na
+        self.order[na], self.order[nb] = b, a
+
+    def update(self, symbol: int) -> None:
+        node = self.leaf[symbol]
+        if node < 0:
+            # NYT становится внутренним узлом с новым NYT и листом символа
+            old = self.nyt
+            number = self.number[old]
+            self.nyt = self._new_node(old, -1, number - 2)
+            node = self._new_node(old, symbol, number - 1)
+            self.left[old], self.right[old] = self.nyt, node
+            self.leaf[symbol] = node
+
+        weight, order = self.weight, self.order
+        while node >= 0:
+            w = weight[node]
+            lead = self.number[node]
+            while lead < self.max_number and weight[order[lead + 1]] == w:
+                lead += 1
+            leader = order[lead]
+            if leader != node and leader != self.parent[node]:
+                self._swap(node, leader)
+            weight[node] += 1
+            node = self.parent[node]
+
+
+class AdaptiveHuffmanEncoder:
+    def __init__(self) -> None:
+        self.tree = AdaptiveHuffmanTree()
+        self.writer = BitWriter()
+
+    def _encode_symbol(self, symbol: int) -> None:
+        code, length, new = self.tree.code(symbol)
+        if length:
+            self.writer.write(code, length)
+        if new:
+            self.writer.write(symbol, LITERAL_BITS)
+        self.tree.update(symbol)
+
+    def encode(self, data: bytes) -> bytes:
+        for byte in data:
+            self._encode_symbol(byte)
+        return self.writer.take()
+
+    def finish(self) -> bytes:
+        self._encode_symbol(EOF_SYMBOL)
+        return self.writer.finish()
+
+
+class AdaptiveHuffmanDecoder:
+    # Разбирает поток по одному биту, поэтому куски могут резаться где угодно
+    def __init__(self) -> None:
+        self.tree = AdaptiveHuffmanTree()
+        self.node = self.tree.root
+        self.literal = 0
+        self.literal_bits = LITERAL_BITS
+        self.done = False
+
+    def _emit(self, symbol: int, out: bytearray) -> None:
+        if symbol == EOF_SYMBOL:
+            self.done = True
+            return
+        out.append(symbol)
+        self.tree.update(symbol)
+        self.node = self.tree.root
+
+    def decode(self, data: bytes) -> bytes:
+        out = bytearray()
+        tree = self.tree
+        for byte in data:
+            for shift in range(7, -1, -1):
+                if self.done:
+                    return bytes(out)
+                bit = (byte >> shift) & 1
+                if self.literal_bits:
+                    self.literal = (self.literal << 1) | bit
+                    self.literal_bits -= 1
+                    if not self.literal_bits:
+                        self._emit(self.literal, out)
+                    continue
+                self.node = tree.right[self.node] if bit else tree.left[self.node]
+                if tree.left[self.node] < 0:
+                    if self.node == tree.nyt:
+                        self.literal = 0
+                        self.literal_bits = LITERAL_BITS
+                    else:
+                        self._emit(tree.symbol[self.node], out)
+        return bytes(out)
+
+
+def adaptive_encode_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    encoder = AdaptiveHuffmanEncoder()
+    for chunk in chunks:
+        yield encoder.encode(chunk)
+    yield encoder.finish()
+
+
+def adaptive_decode_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    decoder = AdaptiveHuffmanDecoder()
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+        if decoder.done:
+            return
+    if not decoder.done:
+        raise ValueError("Поток оборвался до символа конца")
+
+
+def adaptive_encode(data: bytes) -> bytes:
+    return b"".join(adaptive_encode_stream([data]))
+
+
+def adaptive_decode(data: bytes) -> bytes:
+    return b"".join(adaptive_decode_stream([data]))
@@ -0,0 +1,145 @@
+import argparse
+import csv
+import json
+import os
+import time
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from adaptive_huffman import adaptive_decode, adaptive_encode
+from container import serialize_code_table
+from frequency import count_ngrams, sort_by_frequency
+from huffman import build_huffman_table, huffman_decode, huffman_encode
+from lzw import lzw_decode, lzw_encode
+from main import calculate_shannon_entropy, gettext
+from tokens import encode_tokens
+
+
+# Каждый кодек возвращает (полезная нагрузка, контекст для декодера).
+# У кодеков Хаффмана первым в контексте идёт таблица кодов: она нужна декодеру
+# и учитывается в размере сжатых данных так же, как в контейнере
+def encode_huffman_chars(text: str) -> tuple[bytes, tuple]:
+    table = build_huffman_table(count_ngrams(text, 1))
+    payload, _ = huffman_encode(text, table)
+    return payload, (table, len(text))
+
+
+def decode_huffman_chars(payload: bytes, context: tuple) -> str:
+    table, count = context
+    return "".join(huffman_decode(payload, table, count))
+
+
+def encode_huffman_pairs(text: str) -> tuple[bytes, tuple]:
+    # Неперекрывающиеся пары; при нечётной длине последний символ идёт отдельно
+    pairs = [text[i:i + 2] for i in range(0, len(text), 2)]
+    table = build_huffman_table(Counter(pairs))
+    payload, _ = huffman_encode(pairs, table)
+    return payload, (table, len(pairs))
+
+
+def encode_huffman_words(text: str) -> tuple[bytes, tuple]:
+    payload, table, count = encode_tokens(text, mode="word")
+    return payload, (table, count)
+
+
+def encode_lzw(text: str) -> tuple[bytes, None]:
+    return lzw_encode(text.encode("utf-8")), None
+
+
+def decode_lzw(payload: bytes, context: None) -> str:
+    return lzw_decode(payload).decode("utf-8")
+
+
+def encode_adaptive(text: str) -> tuple[bytes, None]:
+    return adaptive_encode(text.encode("utf-8")), None
+
+
+def decode_adaptive(payload: bytes, context: None) -> str:
+    return adaptive_decode(payload).decode("utf-8")
+
+
+CODECS = {
+    "huffman_chars": (encode_huffman_chars, decode_huffman_chars),
+    "huffman_pairs": (encode_huffman_pairs, decode_huffman_chars),
+    "huffman_words": (encode_huffman_words, decode_huffman_chars),
+    "lzw": (encode_lzw, decode_lzw),
+    "adaptive_huffman": (encode_adaptive, decode_adaptive),
+}
+
+
+def run_case(filepath: str, codec: str) -> dict:
+    encode, decode = CODECS[codec]
+    text = gettext(filepath)
+    size = len(text.encode("utf-8"))
+    entropy = calculate_shannon_entropy(sort_by_frequency(count_ngrams(text, 1)), len(text)) if text else 0
+
+    start = time.perf_counter()
+    payload, context = encode(text)
+    encode_time = time.perf_counter() - start
+    start = time.perf_counter()
+    decoded = decode(payload, context)
+    decode_time = time.perf_counter() - start
+    table_bytes = len(serialize_code_table(context[0])) if context else 0
+    compressed = len(payload) + table_bytes
+
+    # tracemalloc заметно замедляет код, поэтому память меряется отдельным прогоном
+    tracemalloc.start()
+    decode(*encode(text))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "file": filepath,
+        "codec": codec,
+        "original_bytes": size,
+        "payload_bytes": len(payload),
+        "table_bytes": table_bytes,
+        "compressed_bytes": compressed,
+        "ratio": size / compressed if compressed else 0,
+        "bits_per_symbol": compressed * 8 / len(text) if text else 0,
+        "entropy": entropy,
+        "encode_mb_s": size / 1e6 / encode_time if encode_time else 0,
+        "decode_mb_s": size / 1e6 / decode_time if decode_time else 0,
+        "peak_memory_bytes": peak,
+        "roundtrip_ok": decoded == text,
+    }
+
+
+def run_benchmark(corpus: str, pattern: str = "*.txt", codecs: list | None = None, workers: int | None = None) -> list[dict]:
+    files = sorted(str(p) for p in Path(corpus).glob(pattern) if p.is_file())
+    cases = [(f, c) for f in files for c in (codecs or CODECS)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_case, *zip(*cases))) if cases else []
+
+
+def save_results(results: list[dict], json_path: str | None = None, csv_path: str | None = None) -> None:
+    if json_path:
+        with open(json_path, "w") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+    if csv_path and results:
+        with open(csv_path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сравнение кодеков Lab4 на корпусе файлов")
+    parser.add_argument("corpus", nargs="?", default=os.path.dirname(__file__) or ".")
+    parser.add_argument("--pattern", default="*.txt")
+    parser.add_argument("--codecs", nargs="+", choices=list(CODECS))
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--json")
+    parser.add_argument("--csv")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.corpus, args.pattern, args.codecs, args.workers)
+    for r in results:
+        print(f"{r['file']} {r['codec']:>16}: ratio {r['ratio']:.3f}, "
+              f"{r['bits_per_symbol']:.3f} бит/символ (энтропия {r['entropy']:.3f}), "
+              f"{r['encode_mb_s']:.2f}/{r['decode_mb_s']:.2f} МБ/с, "
+              f"память {r['peak_memory_bytes'] / 1e6:.1f} МБ, "
+              f"{'OK' if r['roundtrip_ok'] else 'ОШИБКА'}")
+    save_results(results, args.json, args.csv)
@@ -0,0 +1,80 @@
+class BitWriter:
+    # Копит биты в целом числе и сбрасывает их в bytearray целыми байтами
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self.acc = 0
+        self.acc_bits = 0
+        self.bit_length = 0
+
+    def write(self, code: int, length: int) -> None:
+        self.acc = (self.acc << length) | code
+        self.acc_bits += length
+        self.bit_length += length
+        if self.acc_bits >= 64:
+            self._flush_bytes()
+
+    def _flush_bytes(self) -> None:
+        nbytes = self.acc_bits >> 3
+        rest = self.acc_bits & 7
+        self.buffer += (self.acc >> rest).to_bytes(nbytes, "big")
+        self.acc &= (1 << rest) - 1
+        self.acc_bits = rest
+
+    def take(self) -> bytes:
+        # Забирает все готовые байты, оставляя в аккумуляторе неполный байт
+        self._flush_bytes()
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+    def finish(self) -> bytes:
+        # Дополняет последний байт нулями
+        if self.acc_bits & 7:
+            pad = 8 - (self.acc_bits & 7)
+            self.acc <<= pad
+            self.acc_bits += pad
+        return self.take()
+
+
+class BitReader:
+    # Читает биты из потока кусков bytes; недостающие в конце биты считаются нулями
+    def __init__(self, chunks) -> None:
+        self.chunks = iter(chunks)
+        self.data = b""
+        self.pos = 0
+        self.acc = 0
+        self.acc_bits = 0
+        self.exhausted = False
+
+    def fill(self, nbits: int) -> bool:
+        while self.acc_bits < nbits:
+            if self.pos >= len(self.data):
+                chunk = next(self.chunks, None)
+                if chunk is None:
+                    self.exhausted = True
+                    return False
+                self.data = chunk
+                self.pos = 0
+                continue
+            take = min(len(self.data) - self.pos, 8)
+            self.acc = (self.acc << (8 * take)) | int.from_bytes(self.data[self.pos:self.pos + take], "big")
+            self.acc_bits += 8 * take
+            self.pos += take
+        return True
+
+    def peek(self, nbits: int) -> int:
+        if not self.fill(nbits):
+            return (self.acc << (nbits - self.acc_bits)) & ((1 << nbits) - 1)
+        return (self.acc >> (self.acc_bits - nbits)) & ((1 << nbits) - 1)
+
+    def skip(self, nbits: int) -> None:
+        self.acc_bits = max(self.acc_bits - nbits, 0)
+        self.acc &= (1 << self.acc_bits) - 1
+
+    def read(self, nbits: int) -> int:
+        value = self.peek(nbits)
+        self.skip(nbits)
+        return value
+
+    def at_end(self) -> bool:
+        return self.acc_bits == 0 and not self.fill(1)
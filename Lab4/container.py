@@ -0,0 +1,173 @@
+import codecs
+import mmap
+import struct
+import weakref
+import zlib
+from collections.abc import Iterable, Iterator, Mapping
+
+from adaptive_huffman import adaptive_decode_stream
+from huffman import HuffmanDecoder, canonical_order, codes_from_canonical
+from lzw import lzw_decode_stream
+
+# Формат файла:
+#   заголовок  HEADER (магия, версия, метод, число символов, длины таблицы и данных)
+#   таблица    для Хаффмана: канонические длины и символы; для LZW: max_bits
+#   данные     закодированный поток
+#   CRC32      контрольная сумма таблицы и данных
+MAGIC = b"L4CC"
+VERSION = 1
+HEADER = struct.Struct(">4sBBxxQQI")
+TRAILER = struct.Struct(">I")
+
+METHOD_HUFFMAN = 1
+METHOD_LZW = 2
+METHOD_ADAPTIVE = 3
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(buf, pos: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def serialize_code_table(table: Mapping) -> bytes:
+    # Передаются только число кодов каждой длины и символы в каноническом порядке
+    bl_count, symbols = canonical_order({s: length for s, (_, length) in table.items()})
+    out = bytearray()
+    write_varint(out, len(bl_count) - 1)
+    for count in bl_count[1:]:
+        write_varint(out, count)
+    for symbol in symbols:
+        raw = symbol.encode("utf-8")
+        write_varint(out, len(raw))
+        out += raw
+    return bytes(out)
+
+
+def parse_code_table(buf, pos: int = 0) -> tuple[dict, int]:
+    max_len, pos = read_varint(buf, pos)
+    bl_count = [0]
+    for _ in range(max_len):
+        count, pos = read_varint(buf, pos)
+        bl_count.append(count)
+    symbols = []
+    for _ in range(sum(bl_count)):
+        size, pos = read_varint(buf, pos)
+        symbols.append(bytes(buf[pos:pos + size]).decode("utf-8"))
+        pos += size
+    return codes_from_canonical(bl_count, symbols), pos
+
+
+def save_container(path: str, method: int, payload: Iterable[bytes], count: int = 0, table_data: bytes = b"") -> int:
+    # Данные пишутся по мере поступления; длина вписывается в заголовок в конце
+    crc = zlib.crc32(table_data)
+    payload_len = 0
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, method, count, 0, len(table_data)))
+        file.write(table_data)
+        for chunk in payload:
+            file.write(chunk)
+            crc = zlib.crc32(chunk, crc)
+            payload_len += len(chunk)
+        file.write(TRAILER.pack(crc))
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, method, count, payload_len, len(table_data)))
+    return payload_len
+
+
+class Container:
+    # Файл отображается в память; данные отдаются срезами memoryview без копирования
+    def __init__(self, path: str) -> None:
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+        # Незавершённые генераторы держат срезы отображения; close() закрывает их
+        self.streams = weakref.WeakSet()
+        if len(self.view) < HEADER.size + TRAILER.size:
+            self.close()
+            raise ValueError("Файл слишком короткий")
+        magic, version, self.method, self.count, payload_len, table_len = HEADER.unpack_from(self.view)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("Неизвестный формат файла")
+        start = HEADER.size + table_len
+        if start + payload_len + TRAILER.size > len(self.view):
+            self.close()
+            raise ValueError("Файл обрезан или повреждён")
+        self.table_data = self.view[HEADER.size:start]
+        self.payload = self.view[start:start + payload_len]
+        (self.crc,) = TRAILER.unpack_from(self.view, start + payload_len)
+
+    def verify(self) -> bool:
+        return zlib.crc32(self.payload, zlib.crc32(self.table_data)) == self.crc
+
+    def track(self, stream: Iterator) -> Iterator:
+        self.streams.add(stream)
+        return stream
+
+    def chunks(self, chunk_size: int = 1 << 20) -> Iterator[memoryview]:
+        return self.track(self._chunks(chunk_size))
+
+    def _chunks(self, chunk_size: int) -> Iterator[memoryview]:
+        for pos in range(0, len(self.payload), chunk_size):
+            yield self.payload[pos:pos + chunk_size]
+
+    def decode_stream(self, chunk_size: int = 1 << 20) -> Iterator[str]:
+        return self.track(self._decode_stream(chunk_size))
+
+    def _decode_stream(self, chunk_size: int) -> Iterator[str]:
+        if self.method == METHOD_HUFFMAN:
+            if not self.count:
+                return
+            table, _ = parse_code_table(self.table_data)
+            for batch in HuffmanDecoder(table).decode_stream(self.chunks(chunk_size), self.count, chunk_size):
+                yield "".join(batch)
+            return
+        if self.method == METHOD_LZW:
+            stream = lzw_decode_stream(self.chunks(chunk_size))
+        elif self.method == METHOD_ADAPTIVE:
+            stream = adaptive_decode_stream(self.chunks(chunk_size))
+        else:
+            raise ValueError(f"Неизвестный метод {self.method}")
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        for piece in stream:
+            yield decoder.decode(piece)
+        yield decoder.decode(b"", final=True)
+
+    def decode(self) -> str:
+        return "".join(self.decode_stream())
+
+    def close(self) -> None:
+        # Закрытые генераторы отпускают свои срезы. Если срезы ещё держит
+        # вызывающий код, отображение закроется сборщиком мусора вместе с ними
+        for stream in list(self.streams):
+            stream.close()
+        self.table_data = self.payload = None
+        self.view.release()
+        try:
+            self.map.close()
+        except BufferError:
+            pass
+        self.file.close()
+
+    def __enter__(self) -> "Container":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_container(path: str) -> Container:
+    return Container(path)
@@ -0,0 +1,51 @@
+from collections import Counter
+from collections.abc import Iterable, Mapping
+
+
+def count_ngrams(text: str, n: int = 1) -> Counter:
+    # Один линейный проход; n-граммы перекрываются, поэтому "aaa" даёт две пары "aa"
+    if n == 1:
+        return Counter(text)
+    if n == 2:
+        return Counter(map(str.__add__, text, text[1:]))
+    return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+class NgramCounter:
+    # Считает n-граммы по потоку кусков: последние n-1 символов куска
+    # переносятся в следующий, так что результат совпадает с подсчётом по всему тексту
+    def __init__(self, n: int = 1) -> None:
+        self.n = n
+        self.counts = Counter()
+        self.tail = ""
+
+    def update(self, chunk: str) -> None:
+        text = self.tail + chunk
+        self.counts.update(count_ngrams(text, self.n))
+        self.tail = text[max(len(text) - self.n + 1, 0):] if self.n > 1 else ""
+
+    def merge(self, other: "NgramCounter") -> None:
+        # Слияние счётчиков разных файлов: n-граммы на их стыке не считаются
+        self.counts.update(other.counts)
+
+    def total(self) -> int:
+        return self.counts.total()
+
+
+def count_chunks(chunks: Iterable[str], n: int = 1) -> Counter:
+    counter = NgramCounter(n)
+    for chunk in chunks:
+        counter.update(chunk)
+    return counter.counts
+
+
+def merge_counts(*counts: Mapping) -> Counter:
+    merged = Counter()
+    for c in counts:
+        merged.update(c)
+    return merged
+
+
+def sort_by_frequency(counts: Mapping) -> list:
+    # [[n-грамма, частота], ...] по убыванию частоты, при равенстве по n-грамме
+    return [[gram, freq] for gram, freq in sorted(counts.items(), key=lambda item: (-item[1], item[0]))]
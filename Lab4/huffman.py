@@ -0,0 +1,186 @@
+import heapq
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+from bitio import BitReader, BitWriter
+
+
+def build_code_lengths(frequencies: Mapping | Iterable) -> dict:
+    # Принимает словарь {символ: частота} или пары [символ, частота]
+    items = list(frequencies.items() if isinstance(frequencies, Mapping) else frequencies)
+    if not items:
+        return {}
+    if len(items) == 1:
+        return {items[0][0]: 1}
+
+    # Куча из (частота, номер узла); номер узла заодно разрешает равенство частот
+    heap = [(freq, i) for i, (_, freq) in enumerate(items)]
+    heapq.heapify(heap)
+    parent = [0] * (2 * len(items) - 1)
+    next_id = len(items)
+    while len(heap) > 1:
+        freq1, node1 = heapq.heappop(heap)
+        freq2, node2 = heapq.heappop(heap)
+        parent[node1] = parent[node2] = next_id
+        heapq.heappush(heap, (freq1 + freq2, next_id))
+        next_id += 1
+
+    # Внутренние узлы создаются по возрастанию номера, корень последний,
+    # поэтому глубину можно посчитать одним проходом от корня вниз
+    root = next_id - 1
+    depth = [0] * next_id
+    for node in range(root - 1, -1, -1):
+        depth[node] = depth[parent[node]] + 1
+
+    return {symbol: depth[i] for i, (symbol, _) in enumerate(items)}
+
+
+def canonical_order(lengths: Mapping) -> tuple[list[int], list]:
+    # Каноническая форма таблицы: число кодов каждой длины и символы,
+    # упорядоченные по (длина, символ). По ней таблица восстанавливается однозначно
+    symbols = sorted(lengths, key=lambda s: (lengths[s], s))
+    max_len = max(lengths.values(), default=0)
+    bl_count = [0] * (max_len + 1)
+    for symbol in symbols:
+        bl_count[lengths[symbol]] += 1
+    return bl_count, symbols
+
+
+def codes_from_canonical(bl_count: list[int], symbols: list) -> dict:
+    table = {}
+    code = 0
+    index = 0
+    for length in range(1, len(bl_count)):
+        for _ in range(bl_count[length]):
+            table[symbols[index]] = (code, length)
+            code += 1
+            index += 1
+        code <<= 1
+    return table
+
+
+def canonical_codes(lengths: Mapping) -> dict:
+    # {символ: (код, длина)}
+    return codes_from_canonical(*canonical_order(lengths))
+
+
+def build_huffman_table(frequencies: Mapping | Iterable) -> dict:
+    return canonical_codes(build_code_lengths(frequencies))
+
+
+def encode_symbols(writer: BitWriter, symbols: Iterable, table: Mapping) -> None:
+    # Один поиск в таблице на символ; аккумулятор вынесен в локальные переменные
+    acc, acc_bits, buffer = writer.acc, writer.acc_bits, writer.buffer
+    total = 0
+    for symbol in symbols:
+        code, length = table[symbol]
+        acc = (acc << length) | code
+        acc_bits += length
+        total += length
+        if acc_bits >= 64:
+            rest = acc_bits & 7
+            buffer += (acc >> rest).to_bytes(acc_bits >> 3, "big")
+            acc &= (1 << rest) - 1
+            acc_bits = rest
+    writer.acc, writer.acc_bits = acc, acc_bits
+    writer.bit_length += total
+
+
+def huffman_encode(symbols: Iterable, table: Mapping) -> tuple[bytes, int]:
+    writer = BitWriter()
+    encode_symbols(writer, symbols, table)
+    bit_length = writer.bit_length
+    return writer.finish(), bit_length
+
+
+class HuffmanDecoder:
+    def __init__(self, table: Mapping, lookup_bits: int = 10) -> None:
+        self.bl_count, self.symbols = canonical_order({s: length for s, (_, length) in table.items()})
+        self.max_len = len(self.bl_count) - 1
+        self.lookup_bits = max(1, min(lookup_bits, self.max_len))
+
+        # Первый код и индекс первого символа для каждой длины (медленный путь)
+        self.first_code = [0] * (self.max_len + 1)
+        self.first_index = [0] * (self.max_len + 1)
+        code = index = 0
+        for length in range(1, self.max_len + 1):
+            code = (code + self.bl_count[length - 1]) << 1
+            index += self.bl_count[length - 1]
+            self.first_code[length] = code
+            self.first_index[length] = index
+
+        self.lookup = [self._decode_prefix(prefix) for prefix in range(1 << self.lookup_bits)]
+
+    def _match(self, code: int, length: int) -> Any:
+        offset = code - self.first_code[length]
+        if 0 <= offset < self.bl_count[length]:
+            return self.symbols[self.first_index[length] + offset]
+        return None
+
+    def _decode_prefix(self, prefix: int) -> tuple[tuple, int]:
+        # Все символы, коды которых целиком помещаются в следующие k бит
+        k = self.lookup_bits
+        decoded = []
+        pos = 0
+        while pos < k:
+            code = 0
+            for length in range(1, min(self.max_len, k - pos) + 1):
+                code = (code << 1) | ((prefix >> (k - pos - length)) & 1)
+                symbol = self._match(code, length)
+                if symbol is not None:
+                    decoded.append(symbol)
+                    pos += length
+                    break
+            else:
+                break
+        return tuple(decoded), pos
+
+    def _decode_long(self, reader: BitReader) -> Any:
+        code = 0
+        for length in range(1, self.max_len + 1):
+            code = (code << 1) | reader.read(1)
+            symbol = self._match(code, length)
+            if symbol is not None:
+                return symbol
+        raise ValueError("Некорректный код")
+
+    def decode_stream(self, chunks: Iterable, count: int, batch_size: int = 1 << 16) -> Iterator[list]:
+        reader = BitReader(chunks)
+        k = self.lookup_bits
+        mask = (1 << k) - 1
+        lookup = self.lookup
+        out = []
+        produced = 0
+        while produced < count:
+            if reader.acc_bits < k:
+                reader.fill(k)
+            if reader.acc_bits >= k:
+                prefix = (reader.acc >> (reader.acc_bits - k)) & mask
+            else:
+                prefix = (reader.acc << (k - reader.acc_bits)) & mask
+            decoded, used = lookup[prefix]
+            if used:
+                out.extend(decoded)
+                produced += len(decoded)
+                reader.skip(used)
+            else:
+                out.append(self._decode_long(reader))
+                produced += 1
+            if produced > count:
+                del out[count - produced:]
+                produced = count
+            if len(out) >= batch_size:
+                yield out
+                out = []
+        if out:
+            yield out
+
+    def decode(self, data: bytes, count: int) -> list:
+        decoded = []
+        for batch in self.decode_stream([data], count):
+            decoded.extend(batch)
+        return decoded
+
+
+def huffman_decode(data: bytes, table: Mapping, count: int) -> list:
+    return HuffmanDecoder(table).decode(data, count)
@@ -0,0 +1,138 @@
+from collections.abc import Iterable, Iterator
+
+from bitio import BitWriter
+
+CLEAR_CODE = 256
+EOF_CODE = 257
+FIRST_CODE = 258
+MIN_BITS = 9
+
+
+# Словарь хранится как {(код префикса << 8) | байт: код}, строки не собираются.
+# Ширина кода растёт с 9 бит по мере заполнения словаря; когда словарь
+# достигает 2^max_bits записей, выдаётся код очистки и словарь сбрасывается
+class LZWEncoder:
+    def __init__(self, max_bits: int = 16) -> None:
+        if not MIN_BITS <= max_bits <= 24:
+            raise ValueError(f"Ширина кода должна быть от {MIN_BITS} до 24 бит")
+        self.max_code = 1 << max_bits
+        self.writer = BitWriter()
+        self.prefix = -1
+        self._reset()
+
+    def _reset(self) -> None:
+        self.dictionary = {}
+        self.next_code = FIRST_CODE
+
+    def _emit(self, code: int) -> None:
+        # Декодер отстаёт на одну запись, поэтому ширина считается по next_code - 1
+        self.writer.write(code, max(MIN_BITS, (self.next_code - 1).bit_length()))
+
+    def encode(self, data: bytes) -> bytes:
+        dictionary = self.dictionary
+        w = self.prefix
+        for byte in data:
+            if w < 0:
+                w = byte
+                continue
+            key = (w << 8) | byte
+            code = dictionary.get(key)
+            if code is not None:
+                w = code
+                continue
+            self._emit(w)
+            dictionary[key] = self.next_code
+            self.next_code += 1
+            if self.next_code == self.max_code:
+                self._emit(CLEAR_CODE)
+                self._reset()
+                dictionary = self.dictionary
+            w = byte
+        self.prefix = w
+        return self.writer.take()
+
+    def finish(self) -> bytes:
+        if self.prefix >= 0:
+            self._emit(self.prefix)
+            # Декодер после последнего кода добавит запись, учитываем её в ширине EOF
+            self.next_code += 1
+            self.prefix = -1
+        self._emit(EOF_CODE)
+        return self.writer.finish()
+
+
+class LZWDecoder:
+    def __init__(self) -> None:
+        self.acc = 0
+        self.acc_bits = 0
+        self.done = False
+        self._reset()
+
+    def _reset(self) -> None:
+        # Места 256 и 257 заняты служебными кодами
+        self.entries = [bytes([i]) for i in range(256)] + [b"", b""]
+        self.prev = None
+
+    def decode(self, data: bytes) -> bytes:
+        out = bytearray()
+        entries = self.entries
+        acc, acc_bits = self.acc, self.acc_bits
+        for byte in data:
+            if self.done:
+                break
+            acc = (acc << 8) | byte
+            acc_bits += 8
+            width = max(MIN_BITS, len(entries).bit_length())
+            while acc_bits >= width:
+                acc_bits -= width
+                code = acc >> acc_bits
+                acc &= (1 << acc_bits) - 1
+                if code == CLEAR_CODE:
+                    self._reset()
+                    entries = self.entries
+                elif code == EOF_CODE:
+                    self.done = True
+                    break
+                elif self.prev is None:
+                    if code >= CLEAR_CODE:
+                        raise ValueError("Некорректный код")
+                    self.prev = entries[code]
+                    out += self.prev
+                else:
+                    if code < len(entries):
+                        entry = entries[code]
+                    elif code == len(entries):
+                        entry = self.prev + self.prev[:1]
+                    else:
+                        raise ValueError("Некорректный код")
+                    out += entry
+                    entries.append(self.prev + entry[:1])
+                    self.prev = entry
+                width = max(MIN_BITS, len(entries).bit_length())
+        self.acc, self.acc_bits = acc, acc_bits
+        return bytes(out)
+
+
+def lzw_encode_stream(chunks: Iterable[bytes], max_bits: int = 16) -> Iterator[bytes]:
+    encoder = LZWEncoder(max_bits)
+    for chunk in chunks:
+        yield encoder.encode(chunk)
+    yield encoder.finish()
+
+
+def lzw_decode_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    decoder = LZWDecoder()
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+        if decoder.done:
+            return
+    if not decoder.done:
+        raise ValueError("Поток LZW оборвался до кода конца")
+
+
+def lzw_encode(data: bytes, max_bits: int = 16) -> bytes:
+    return b"".join(lzw_encode_stream([data], max_bits))
+
+
+def lzw_decode(data: bytes) -> bytes:
+    return b"".join(lzw_decode_stream([data]))
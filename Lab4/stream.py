@@ -0,0 +1,67 @@
+import sys
+from collections.abc import Iterator
+
+from adaptive_huffman import adaptive_encode_stream
+from bitio import BitWriter
+from container import METHOD_ADAPTIVE, METHOD_HUFFMAN, METHOD_LZW, open_container, save_container, serialize_code_table
+from frequency import count_chunks
+from huffman import build_huffman_table, encode_symbols
+from lzw import lzw_encode_stream
+
+CHUNK_SIZE = 1 << 20
+METHODS = {"huffman": METHOD_HUFFMAN, "lzw": METHOD_LZW, "adaptive": METHOD_ADAPTIVE}
+
+
+def read_chunks(filepath: str, chunk_size: int = CHUNK_SIZE, lower: bool = True) -> Iterator[str]:
+    with open(filepath, "r") as file:
+        while chunk := file.read(chunk_size):
+            yield chunk.lower() if lower else chunk
+
+
+def huffman_payload(chunks, table: dict) -> Iterator[bytes]:
+    writer = BitWriter()
+    for chunk in chunks:
+        encode_symbols(writer, chunk, table)
+        yield writer.take()
+    yield writer.finish()
+
+
+# Хаффман делает два прохода: сначала статистика, затем кодирование.
+# LZW и адаптивный Хаффман обходятся одним. В памяти одновременно
+# находятся только один кусок текста и таблица кодов
+def compress_file(src: str, dst: str, method: str = "huffman", chunk_size: int = CHUNK_SIZE, lower: bool = True, max_bits: int = 16) -> int:
+    if method == "huffman":
+        counts = count_chunks(read_chunks(src, chunk_size, lower))
+        table = build_huffman_table(counts)
+        payload = huffman_payload(read_chunks(src, chunk_size, lower), table)
+        return save_container(dst, METHOD_HUFFMAN, payload, counts.total(), serialize_code_table(table))
+
+    raw_chunks = (chunk.encode("utf-8") for chunk in read_chunks(src, chunk_size, lower))
+    if method == "lzw":
+        return save_container(dst, METHOD_LZW, lzw_encode_stream(raw_chunks, max_bits), table_data=bytes([max_bits]))
+    if method == "adaptive":
+        return save_container(dst, METHOD_ADAPTIVE, adaptive_encode_stream(raw_chunks))
+    raise ValueError(f"Неизвестный метод {method}")
+
+
+def decompress_file(src: str, dst: str, chunk_size: int = CHUNK_SIZE) -> int:
+    written = 0
+    with open_container(src) as container, open(dst, "w") as out:
+        if not container.verify():
+            raise ValueError("Контрольная сумма не совпадает")
+        for piece in container.decode_stream(chunk_size):
+            out.write(piece)
+            written += len(piece)
+    return written
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (4, 5) or sys.argv[1] not in ("compress", "decompress") or (len(sys.argv) == 5 and sys.argv[4] not in METHODS):
+        print("Использование: python Lab4/stream.py compress|decompress <вход> <выход> [huffman|lzw|adaptive]")
+        sys.exit(1)
+    if sys.argv[1] == "compress":
+        size = compress_file(sys.argv[2], sys.argv[3], *sys.argv[4:])
+        print("\033[32m Длина закодированного потока (в байтах):\033[0m", size)
+    else:
+        count = decompress_file(sys.argv[2], sys.argv[3])
+        print("\033[32m Раскодировано символов:\033[0m", count)
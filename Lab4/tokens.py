@@ -0,0 +1,92 @@
+import re
+from collections import Counter
+
+from frequency import count_ngrams
+from huffman import build_code_lengths, build_huffman_table, huffman_decode, huffman_encode
+
+WORD_RE = re.compile(r"\w+")
+
+
+def build_vocabulary(text: str, mode: str = "kgram", k: int = 2, max_tokens: int = 4096) -> Counter:
+    # Одиночные символы входят всегда, чтобы любой текст можно было разбить
+    candidates = Counter()
+    if mode == "kgram":
+        for n in range(2, k + 1):
+            candidates.update(count_ngrams(text, n))
+    elif mode == "word":
+        candidates.update(WORD_RE.findall(text))
+    else:
+        raise ValueError(f"Неизвестный режим {mode}")
+    candidates = Counter({t: c for t, c in candidates.items() if len(t) > 1})
+    # Оставляем токены с наибольшей оценкой экономии: частота * (длина - 1)
+    best = sorted(candidates.items(), key=lambda item: (-item[1] * (len(item[0]) - 1), item[0]))[:max_tokens]
+    vocabulary = count_ngrams(text, 1)
+    vocabulary.update(dict(best))
+    return vocabulary
+
+
+class TokenTrie:
+    def __init__(self, tokens) -> None:
+        self.root = {}
+        self.max_len = 0
+        for token in tokens:
+            node = self.root
+            for char in token:
+                node = node.setdefault(char, {})
+            node[""] = token
+            self.max_len = max(self.max_len, len(token))
+
+
+def segment(text: str, trie: TokenTrie, lengths: dict, default_length: int) -> list[str]:
+    # Динамика справа налево: cost[i] - минимальное число бит для text[i:].
+    # Из позиции i обходим бор не глубже самого длинного токена, то есть O(len(text) * max_len)
+    n = len(text)
+    cost = [0] * (n + 1)
+    step = [0] * (n + 1)
+    root = trie.root
+    for i in range(n - 1, -1, -1):
+        best = -1
+        node = root
+        j = i
+        while j < n:
+            node = node.get(text[j])
+            if node is None:
+                break
+            j += 1
+            token = node.get("")
+            if token is not None:
+                c = lengths.get(token, default_length) + cost[j]
+                if best < 0 or c < best:
+                    best = c
+                    step[i] = j - i
+        cost[i] = best
+    tokens = []
+    i = 0
+    while i < n:
+        tokens.append(text[i:i + step[i]])
+        i += step[i]
+    return tokens
+
+
+def tokenize(text: str, mode: str = "kgram", k: int = 2, max_tokens: int = 4096, iterations: int = 3) -> tuple[list[str], dict]:
+    # Длины кодов зависят от разбиения, а разбиение от длин, поэтому
+    # несколько раз чередуем оптимальное разбиение и перестройку кодов
+    vocabulary = build_vocabulary(text, mode, k, max_tokens)
+    trie = TokenTrie(vocabulary)
+    lengths = build_code_lengths(vocabulary)
+    tokens = list(text)
+    for _ in range(iterations):
+        default_length = max(lengths.values(), default=0) + 1
+        tokens = segment(text, trie, lengths, default_length)
+        lengths = build_code_lengths(Counter(tokens))
+    return tokens, build_huffman_table(Counter(tokens))
+
+
+def encode_tokens(text: str, mode: str = "kgram", k: int = 2, max_tokens: int = 4096) -> tuple[bytes, dict, int]:
+    tokens, table = tokenize(text, mode, k, max_tokens)
+    payload, _ = huffman_encode(tokens, table)
+    return payload, table, len(tokens)
+
+
+def decode_tokens(payload: bytes, table: dict, count: int) -> str:
+    return "".join(huffman_decode(payload, table, count))
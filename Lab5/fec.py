@@ -0,0 +1,151 @@
+import argparse
+import mmap
+import numpy as np
+from math import lcm
+from typing import Iterable, Iterator
+
+from main_1 import CyclicCode
+
+# Помехоустойчивое кодирование байтового потока. Поток режется на кадры:
+# 4 байта длины полезных данных + данные + нулевое дополнение, всего
+# batch_blocks * k бит. Длина лежит внутри кадра и защищена кодом наравне с данными.
+# При interleave = D биты D соседних кодовых слов перемежаются, и пакет ошибок
+# длины <= D задевает каждое слово не более одного раза
+
+LENGTH_BYTES = 4
+
+
+class FECCodec:
+    def __init__(self, code: CyclicCode, batch_blocks: int = 4096, interleave: int = 1) -> None:
+        # Кадр должен состоять из целого числа байт и целого числа групп перемежения
+        step = lcm(8, interleave)
+        if batch_blocks <= 0 or batch_blocks % step:
+            raise ValueError(f"Число блоков в кадре должно быть кратно {step}")
+        self.code = code
+        self.batch_blocks = batch_blocks
+        self.interleave = interleave
+        self.frame_bytes = batch_blocks * code.k // 8
+        self.encoded_bytes = batch_blocks * code.n // 8
+        self.capacity = self.frame_bytes - LENGTH_BYTES
+        if self.capacity <= 0:
+            raise ValueError("Кадр слишком мал для заголовка длины")
+        self.stats = {"frames": 0, "corrected_blocks": 0, "failed_blocks": 0}
+
+    def interleave_bits(self, codewords: np.ndarray) -> np.ndarray:
+        # (B, n) -> группы по D слов, внутри группы биты идут по столбцам
+        d, n = self.interleave, self.code.n
+        return codewords.reshape(-1, d, n).transpose(0, 2, 1).reshape(-1)
+
+    def deinterleave_bits(self, bits: np.ndarray) -> np.ndarray:
+        d, n = self.interleave, self.code.n
+        return bits.reshape(-1, n, d).transpose(0, 2, 1).reshape(-1, n)
+
+    def encode_frame(self, payload) -> bytes:
+        frame = np.zeros(self.frame_bytes, dtype=np.uint8)
+        payload = np.frombuffer(payload, dtype=np.uint8)
+        frame[:LENGTH_BYTES] = np.frombuffer(len(payload).to_bytes(LENGTH_BYTES, "big"), dtype=np.uint8)
+        frame[LENGTH_BYTES:LENGTH_BYTES + len(payload)] = payload
+        messages = np.unpackbits(frame).reshape(-1, self.code.k)
+        return np.packbits(self.interleave_bits(self.code.encode_batch(messages))).tobytes()
+
+    def decode_frame(self, frame) -> bytes:
+        received = self.deinterleave_bits(np.unpackbits(np.frombuffer(frame, dtype=np.uint8)))
+        detected, patterns, corrected = self.code.decode_batch(received)
+        fixed = patterns.any(axis=1)
+        self.stats["frames"] += 1
+        self.stats["corrected_blocks"] += int(fixed.sum())
+        self.stats["failed_blocks"] += int((detected & ~fixed).sum())
+        # Код систематический: сообщение - первые k бит исправленного слова
+        data = np.packbits(corrected[:, :self.code.k]).tobytes()
+        length = int.from_bytes(data[:LENGTH_BYTES], "big")
+        if length > self.capacity:
+            raise ValueError("Повреждён заголовок кадра: некорректная длина данных")
+        return data[LENGTH_BYTES:LENGTH_BYTES + length]
+
+    def encode_stream(self, chunks: Iterable) -> Iterator[bytes]:
+        # Куски произвольного размера набираются до полного кадра
+        buffer = bytearray()
+        for chunk in chunks:
+            view = memoryview(chunk).cast("B")
+            if not buffer and len(view) >= self.capacity:
+                # Крупный кусок кодируется срезами без копирования
+                whole = len(view) - len(view) % self.capacity
+                for start in range(0, whole, self.capacity):
+                    yield self.encode_frame(view[start:start + self.capacity])
+                view = view[whole:]
+            buffer += view
+            # Отпускаем срез сразу, иначе mmap-источник нельзя будет закрыть
+            view.release()
+            while len(buffer) >= self.capacity:
+                yield self.encode_frame(buffer[:self.capacity])
+                del buffer[:self.capacity]
+        if buffer:
+            yield self.encode_frame(buffer)
+
+    def decode_stream(self, chunks: Iterable) -> Iterator[bytes]:
+        buffer = bytearray()
+        for chunk in chunks:
+            view = memoryview(chunk).cast("B")
+            if not buffer and len(view) >= self.encoded_bytes:
+                whole = len(view) - len(view) % self.encoded_bytes
+                for start in range(0, whole, self.encoded_bytes):
+                    yield self.decode_frame(view[start:start + self.encoded_bytes])
+                view = view[whole:]
+            buffer += view
+            view.release()
+            while len(buffer) >= self.encoded_bytes:
+                yield self.decode_frame(buffer[:self.encoded_bytes])
+                del buffer[:self.encoded_bytes]
+        if buffer:
+            raise ValueError("Поток обрывается посреди кадра")
+
+    def encode(self, data) -> bytes:
+        return b"".join(self.encode_stream([data]))
+
+    def decode(self, data) -> bytes:
+        return b"".join(self.decode_stream([data]))
+
+
+def map_file(path: str) -> Iterator[memoryview]:
+    # mmap пустого файла невозможен, для него поток просто пуст
+    with open(path, "rb") as file:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return
+        with mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+def encode_file(src: str, dst: str, codec: FECCodec) -> None:
+    with open(dst, "wb") as out:
+        for frame in codec.encode_stream(map_file(src)):
+            out.write(frame)
+
+
+def decode_file(src: str, dst: str, codec: FECCodec) -> None:
+    with open(dst, "wb") as out:
+        for payload in codec.decode_stream(map_file(src)):
+            out.write(payload)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Помехоустойчивое кодирование файла кодом Голея (23, 12)")
+    parser.add_argument("mode", choices=["encode", "decode"])
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--batch-blocks", type=int, default=4096)
+    parser.add_argument("--interleave", type=int, default=1)
+    args = parser.parse_args()
+
+    codec = FECCodec(CyclicCode(23, 12, '101011100011'), args.batch_blocks, args.interleave)
+    if args.mode == "encode":
+        encode_file(args.src, args.dst, codec)
+    else:
+        decode_file(args.src, args.dst, codec)
+        print(f"Кадров: {codec.stats['frames']}, исправлено блоков: {codec.stats['corrected_blocks']}, "
+              f"неисправимых блоков: {codec.stats['failed_blocks']}")
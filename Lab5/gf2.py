@@ -0,0 +1,80 @@
+import numpy as np
+from typing import Any
+
+# Многочлены над GF(2) хранятся как целые числа Python: бит i - коэффициент при x^i.
+# Массивы битов, как и в CyclicCode, идут от старшей степени к младшей.
+# Целые Python не ограничены 64 битами, поэтому всё работает и для n > 64
+
+
+def bits_to_int(bits) -> int:
+    bits = np.asarray(bits, dtype=np.uint8)
+    pad = (-len(bits)) % 8
+    packed = np.packbits(np.concatenate([np.zeros(pad, dtype=np.uint8), bits]))
+    return int.from_bytes(packed.tobytes(), "big")
+
+
+def int_to_bits(value: int, width: int) -> np.ndarray[Any, np.dtype[np.uint8]]:
+    nbytes = (width + 7) // 8
+    bits = np.unpackbits(np.frombuffer(value.to_bytes(nbytes, "big"), dtype=np.uint8))
+    return bits[len(bits) - width:]
+
+
+def poly_degree(a: int) -> int:
+    return a.bit_length() - 1
+
+
+def poly_mod(a: int, g: int) -> int:
+    dg = poly_degree(g)
+    while a.bit_length() > dg:
+        a ^= g << (a.bit_length() - 1 - dg)
+    return a
+
+
+def poly_mul(a: int, b: int) -> int:
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a <<= 1
+        b >>= 1
+    return result
+
+
+class PolyModulus:
+    # Деление по модулю g(x) побайтно, как в табличном CRC:
+    # table[t] = (t * x^r) mod g для всех 8-битных t
+    def __init__(self, g: int) -> None:
+        if g < 2:
+            raise ValueError("Степень порождающего многочлена должна быть не меньше 1")
+        self.g = g
+        self.r = poly_degree(g)
+        self.mask = (1 << self.r) - 1
+        self.table = [poly_mod(t << self.r, g) for t in range(256)]
+
+    def mod(self, a: int) -> int:
+        r, mask, table = self.r, self.mask, self.table
+        rem = 0
+        for byte in a.to_bytes((a.bit_length() + 7) // 8, "big"):
+            rem = (rem << 8) | byte
+            rem = (rem & mask) ^ table[rem >> r]
+        return rem
+
+
+def poly_divmod(a: int, b: int) -> tuple[int, int]:
+    quotient = 0
+    db = poly_degree(b)
+    while a.bit_length() > db:
+        shift = a.bit_length() - 1 - db
+        quotient |= 1 << shift
+        a ^= b << shift
+    return quotient, a
+
+
+def poly_gcd(a: int, b: int) -> int:
+    while b:
+        a, b = b, poly_mod(a, b)
+    return a
+
+
+def poly_mulmod(a: int, b: int, m: int) -> int:
+    return poly_mod(poly_mul(a, b), m)
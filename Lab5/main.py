@@ -1,6 +1,10 @@
 import numpy as np
+from functools import cached_property
 from typing import Any
 
+from gf2 import PolyModulus, bits_to_int, int_to_bits, poly_mod
+from weights import minimum_distance
+
 
 class CyclicCode:
     def __init__(self, n, k, generator_poly) -> None:
@@ -10,41 +14,21 @@ class CyclicCode:
         self.generator_poly = generator_poly
         self.g = [int(bit) for bit in generator_poly]
         self.g_degree = len(self.g) - 1
+        self.modulus = PolyModulus(bits_to_int(self.g))
+        if poly_mod((1 << n) | 1, self.modulus.g):
+            raise ValueError(f"Многочлен {generator_poly} не делит x^{n} - 1, код не циклический")
         self.G = self.build_systematic_generator_matrix()
-        self.codewords = self.generate_all_codewords()
         self.d_min = self.calculate_min_distance()
 
     def poly_div(self, dividend, divisor) -> np.ndarray[Any, np.dtype[Any]]:
-        dividend = np.array(dividend, dtype=int)
-        divisor = np.array(divisor, dtype=int)
-        dividend = np.trim_zeros(dividend, 'f')
-        divisor = np.trim_zeros(divisor, 'f')
-
-        if len(dividend) < len(divisor):
-            return dividend.copy()
-
-        remainder = dividend.copy()
-        for i in range(len(dividend) - len(divisor) + 1):
-            if remainder[i] == 1:
-                remainder[i:i + len(divisor)] ^= divisor
-
-        remainder = np.trim_zeros(remainder, 'f')
-        return remainder
+        # Остаток без ведущих нулей, как после np.trim_zeros
+        remainder = poly_mod(bits_to_int(dividend), bits_to_int(divisor))
+        return int_to_bits(remainder, remainder.bit_length()).astype(int)
 
     def build_systematic_generator_matrix(self) -> np.ndarray[Any, np.dtype[Any]]:
         I_k = np.eye(self.k, dtype=int)
-        C = []
-
-        for i in range(self.k):
-            x_power = np.zeros(self.k, dtype=int)
-            x_power[i] = 1
-            shifted = np.concatenate([x_power, np.zeros(self.r, dtype=int)])
-            remainder = self.poly_div(shifted, self.g)
-            if len(remainder) < self.r:
-                remainder = np.concatenate([np.zeros(self.r - len(remainder), dtype=int), remainder])
-            C.append(remainder)
-
-        C = np.array(C, dtype=int)
+        # Строка i: x^(n-1-i) + (x^(n-1-i) mod g(x))
+        C = np.array([int_to_bits(self.modulus.mod(1 << (self.n - 1 - i)), self.r) for i in range(self.k)], dtype=int)
         G = np.hstack([I_k, C])
         return G
 
@@ -52,36 +36,48 @@ class CyclicCode:
         if len(message) != self.k:
             raise ValueError(f"Длина сообщения должна быть {self.k} бит")
 
-        remainder = self.poly_div(np.concatenate([message, np.zeros(self.r, dtype=int)]), self.g)
-        if len(remainder) < self.r:
-            remainder = np.concatenate([np.zeros(self.r - len(remainder), dtype=int), remainder])
-        return np.concatenate([message, remainder])
-
-    def generate_all_codewords(self) -> list:
-        codewords = []
-        for i in range(2**self.k):
-            message = np.array([int(bit) for bit in np.binary_repr(i, width=self.k)], dtype=int)
-            codeword = self.encode(message)
-            codewords.append(codeword)
-        return codewords
-
-    def calculate_min_distance(self) -> Any:
-        min_distance = self.n  # Инициализируем максимально возможным значением
-
-        for i in range(len(self.codewords)):
-            for j in range(i + 1, len(self.codewords)):
-                distance = np.sum(self.codewords[i] != self.codewords[j])
-                if distance < min_distance:
-                    min_distance = distance
-
-        return min_distance
+        shifted = bits_to_int(message) << self.r
+        return int_to_bits(shifted | self.modulus.mod(shifted), self.n).astype(int)
+
+    def encode_batch(self, messages) -> Any:
+        # Пачка сообщений (N, k) кодируется одним произведением на G над GF(2).
+        # Байтовый поток режется на блоки по k бит, результат упаковывается обратно в байты.
+        # Последний неполный блок дополняется нулями до k бит, а выход - нулями до целого
+        # байта, поэтому длину исходных данных нужно передавать отдельно (как в fec.FECCodec)
+        if isinstance(messages, (bytes, bytearray, memoryview)):
+            bits = np.unpackbits(np.frombuffer(messages, dtype=np.uint8))
+            blocks = np.concatenate([bits, np.zeros(-len(bits) % self.k, dtype=np.uint8)]).reshape(-1, self.k)
+            return np.packbits(self.encode_batch(blocks)).tobytes()
+
+        messages = np.asarray(messages, dtype=np.uint8)
+        if messages.ndim != 2 or messages.shape[1] != self.k:
+            raise ValueError(f"Ожидается матрица сообщений размера (N, {self.k})")
+        # float32 идёт через BLAS и точно представляет суммы до 2^24
+        products = messages.astype(np.float32) @ self.G.astype(np.float32)
+        return (products.astype(np.int32) & 1).astype(np.uint8)
+
+    def message_bits(self, values) -> np.ndarray[Any, np.dtype[Any]]:
+        return (np.asarray(values)[:, None] >> np.arange(self.k - 1, -1, -1)) & 1
+
+    def generate_all_codewords(self) -> np.ndarray[Any, np.dtype[np.unsignedinteger]]:
+        return self.encode_batch(self.message_bits(np.arange(2 ** self.k)))
+
+    @cached_property
+    def codewords(self) -> np.ndarray[Any, np.dtype[np.unsignedinteger]]:
+        # Все 2^k слов строятся только при первом обращении
+        return self.generate_all_codewords()
+
+    def calculate_min_distance(self) -> int:
+        # Минимальный вес ненулевого слова без построения всех кодовых слов
+        return minimum_distance(self.G)
 
     def decode(self, received) -> tuple[bool, np.ndarray[Any, np.dtype[Any]]]:
         if len(received) != self.n:
             raise ValueError(f"Длина принятого слова должна быть {self.n} бит")
 
-        remainder = self.poly_div(received, self.g)
-        error_detected = any(remainder != 0)
+        syndrome = self.modulus.mod(bits_to_int(received))
+        remainder = int_to_bits(syndrome, syndrome.bit_length()).astype(int)
+        error_detected = syndrome != 0
         return error_detected, remainder
 
     def get_capabilities(self) -> tuple:
@@ -145,8 +141,8 @@ print("1. Порождающая матрица G:")
 print(code.G)
 
 print("\nФрагмент множества кодовых слов (первые 5):")
-for i in range(min(5, len(code.codewords))):
-    print(f"Сообщение {i}: {code.codewords[i]}")
+for i, codeword in enumerate(code.encode_batch(code.message_bits(np.arange(min(5, 2 ** code.k))))):
+    print(f"Сообщение {i}: {codeword}")
 
 d_min = code.d_min
 detect, correct = code.get_capabilities()
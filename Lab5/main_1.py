@@ -1,6 +1,9 @@
 import numpy as np
+from functools import cached_property
 from typing import Any, Literal
- 
+
+from gf2 import PolyModulus, bits_to_int, int_to_bits, poly_mod
+from weights import decoding_probabilities, minimum_distance, weight_distribution
  
 class CyclicCode:
     def __init__(self, n, k, generator_poly) -> None:
@@ -10,37 +13,23 @@ class CyclicCode:
         self.generator_poly = generator_poly
         self.g = np.array([int(bit) for bit in generator_poly], dtype=np.uint8)
         self.g_degree = len(self.g) - 1
+        self.modulus = PolyModulus(bits_to_int(self.g))
+        if poly_mod((1 << n) | 1, self.modulus.g):
+            raise ValueError(f"Многочлен {generator_poly} не делит x^{n} - 1, код не циклический")
         self.G = self.build_systematic_generator_matrix()
-        self.codewords = self.generate_all_codewords()
         self.d_min = self.calculate_min_distance()
         self.syndrome_table = self.build_syndrome_table()
  
     def poly_div(self, dividend, divisor) -> Any:
-        dividend = np.trim_zeros(dividend, 'f')
-        divisor = np.trim_zeros(divisor, 'f')
- 
-        if len(dividend) < len(divisor):
-            return dividend.copy()
- 
-        remainder = dividend.copy()
-        len_divisor = len(divisor)
-        for i in range(len(dividend) - len_divisor + 1):
-            if remainder[i]:
-                remainder[i:i + len_divisor] ^= divisor
- 
-        return np.trim_zeros(remainder, 'f')
+        remainder = poly_mod(bits_to_int(dividend), bits_to_int(divisor))
+        return int_to_bits(remainder, remainder.bit_length())
  
     def build_systematic_generator_matrix(self) -> np.ndarray[Any, np.dtype[np.unsignedinteger]]:
         I_k = np.eye(self.k, dtype=np.uint8)
         C = np.zeros((self.k, self.r), dtype=np.uint8)
  
         for i in range(self.k):
-            poly = np.zeros(self.n, dtype=np.uint8)
-            poly[i] = 1
-            remainder = self.poly_div(poly, self.g)
-            if len(remainder) < self.r:
-                padded_remainder = np.pad(remainder, (self.r - len(remainder), 0), 'constant')
-                C[i] = padded_remainder[-self.r:]
+            C[i] = int_to_bits(self.modulus.mod(1 << (self.n - 1 - i)), self.r)
  
         return np.hstack([I_k, C])
  
@@ -48,63 +37,110 @@ class CyclicCode:
         if len(message) != self.k:
             raise ValueError(f"Длина сообщения должна быть {self.k} бит")
  
-        message_padded = np.concatenate([message, np.zeros(self.r, dtype=np.uint8)])
-        remainder = self.poly_div(message_padded, self.g)
-        if len(remainder) < self.r:
-            remainder = np.pad(remainder, (self.r - len(remainder), 0), 'constant')
-        return np.concatenate([message, remainder])
+        shifted = bits_to_int(message) << self.r
+        return int_to_bits(shifted | self.modulus.mod(shifted), self.n)
+ 
+    def encode_batch(self, messages) -> Any:
+        # Пачка сообщений (N, k) кодируется одним произведением на G над GF(2).
+        # Байтовый поток режется на блоки по k бит, результат упаковывается обратно в байты.
+        # Последний неполный блок дополняется нулями до k бит, а выход - нулями до целого
+        # байта, поэтому длину исходных данных нужно передавать отдельно (как в fec.FECCodec)
+        if isinstance(messages, (bytes, bytearray, memoryview)):
+            bits = np.unpackbits(np.frombuffer(messages, dtype=np.uint8))
+            blocks = np.concatenate([bits, np.zeros(-len(bits) % self.k, dtype=np.uint8)]).reshape(-1, self.k)
+            return np.packbits(self.encode_batch(blocks)).tobytes()
+
+        messages = np.asarray(messages, dtype=np.uint8)
+        if messages.ndim != 2 or messages.shape[1] != self.k:
+            raise ValueError(f"Ожидается матрица сообщений размера (N, {self.k})")
+        # float32 идёт через BLAS и точно представляет суммы до 2^24
+        products = messages.astype(np.float32) @ self.G.astype(np.float32)
+        return (products.astype(np.int32) & 1).astype(np.uint8)
+ 
+    def message_bits(self, values) -> np.ndarray[Any, np.dtype[Any]]:
+        return (np.asarray(values)[:, None] >> np.arange(self.k - 1, -1, -1)) & 1
  
     def generate_all_codewords(self) -> np.ndarray[Any, np.dtype[np.unsignedinteger]]:
-        codewords = np.zeros((2 ** self.k, self.n), dtype=np.uint8)
-        for i in range(2 ** self.k):
-            message = np.array([int(bit) for bit in f"{i:0{self.k}b}"], dtype=np.uint8)
-            codewords[i] = self.encode(message)
-        return codewords
- 
-    def calculate_min_distance(self) -> Any | Any:
-        nonzero_codewords = [c for c in self.codewords if np.any(c)]
-        if not nonzero_codewords:
-            return self.n
- 
-        min_distance = min(np.sum(c) for c in nonzero_codewords)
-        return min_distance
- 
-    def build_syndrome_table(self) -> dict:
-        syndrome_table = {}
-        for i in range(self.n):
-            error_pattern = np.zeros(self.n, dtype=np.uint8)
-            error_pattern[i] = 1
-            syndrome = self.poly_div(error_pattern, self.g)
-            syndrome_key = tuple(syndrome)
-            syndrome_table[syndrome_key] = error_pattern
-        return syndrome_table
+        return self.encode_batch(self.message_bits(np.arange(2 ** self.k)))
+ 
+    @cached_property
+    def codewords(self) -> np.ndarray[Any, np.dtype[np.unsignedinteger]]:
+        # Все 2^k слов строятся только при первом обращении
+        return self.generate_all_codewords()
+ 
+    def calculate_min_distance(self) -> int:
+        # Минимальный вес ненулевого слова без построения всех кодовых слов
+        return minimum_distance(self.G)
+ 
+    def build_syndrome_table(self) -> np.ndarray[Any, np.dtype[np.unsignedinteger]]:
+        # Лидеры смежных классов для всех 2^r синдромов. Обход в ширину от нулевого
+        # синдрома: на уровне w к лидерам уровня w-1 добавляется по одной ошибке,
+        # поэтому каждый синдром получает вектор ошибки минимального веса
+        size = 1 << self.r
+        self.syndrome_matrix = np.array([int_to_bits(self.modulus.mod(1 << (self.n - 1 - i)), self.r) for i in range(self.n)])
+        unit = np.array([self.modulus.mod(1 << (self.n - 1 - i)) for i in range(self.n)], dtype=np.int64)
+        leaders = np.zeros((size, self.n), dtype=np.uint8)
+        weights = np.zeros(size, dtype=np.int64)
+        known = np.zeros(size, dtype=bool)
+        known[0] = True
+        frontier = np.zeros(1, dtype=np.int64)
+        weight = 0
+        while frontier.size and not known.all():
+            weight += 1
+            candidates = (frontier[:, None] ^ unit[None, :]).ravel()
+            parents = np.repeat(frontier, self.n)
+            positions = np.tile(np.arange(self.n), frontier.size)
+            fresh = ~known[candidates]
+            candidates, first = np.unique(candidates[fresh], return_index=True)
+            parents, positions = parents[fresh][first], positions[fresh][first]
+            leaders[candidates] = leaders[parents]
+            leaders[candidates, positions] = 1
+            weights[candidates] = weight
+            known[candidates] = True
+            frontier = candidates
+        self.leader_weights = weights
+        return leaders
+ 
+    def syndromes(self, received) -> np.ndarray[Any, np.dtype[np.signedinteger]]:
+        # Синдром (N, n) -> целые индексы: чётности через BLAS, затем упаковка битов
+        bits = (np.asarray(received, dtype=np.float32) @ self.syndrome_matrix.astype(np.float32)).astype(np.int64) & 1
+        return bits @ (1 << np.arange(self.r - 1, -1, -1, dtype=np.int64))
  
     def decode(self, received) -> tuple[Literal[False], None, Any] | tuple[Literal[True], Any, Any]:
         if len(received) != self.n:
             raise ValueError(f"Длина принятого слова должна быть {self.n} бит")
  
-        syndrome = self.poly_div(received, self.g)
-        error_detected = np.any(syndrome)
- 
-        if not error_detected:
+        syndrome = self.modulus.mod(bits_to_int(received))
+        if not syndrome:
             return False, None, received  # Нет ошибки
 
-        # print("Таблица палиндромов: ", self.syndrome_table)
-        
-        print()
-        print()
-        print("Синдром: ", syndrome)
-
-        syndrome_key = tuple(syndrome)
-        if syndrome_key in self.syndrome_table:
-            error_pattern = self.syndrome_table[syndrome_key]
+        if self.leader_weights[syndrome] <= (self.d_min - 1) // 2:
+            error_pattern = self.syndrome_table[syndrome]
             corrected = (received + error_pattern) % 2
-            # print("Паттерн ошибки: ", error_pattern)
-            # print("Скорректировано: ", corrected)
             return True, error_pattern, corrected
         else:
             return True, None, received  # Ошибка обнаружена, но не может быть исправлена
  
+    def decode_batch(self, received) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Векторное декодирование матрицы (N, n) без цикла по словам.
+        # Лидеры веса больше t не применяются: такие ошибки только обнаруживаются
+        received = np.asarray(received, dtype=np.uint8)
+        if received.ndim != 2 or received.shape[1] != self.n:
+            raise ValueError(f"Ожидается матрица принятых слов размера (N, {self.n})")
+        syndromes = self.syndromes(received)
+        correctable = self.leader_weights[syndromes] <= (self.d_min - 1) // 2
+        error_patterns = self.syndrome_table[np.where(correctable, syndromes, 0)]
+        return syndromes != 0, error_patterns, received ^ error_patterns
+ 
+    @cached_property
+    def weight_distribution(self) -> list[int]:
+        # A_0..A_n считается один раз на код
+        return weight_distribution(self.G)
+ 
+    def error_probabilities(self, p: float) -> dict:
+        # Точные вероятности для ДСК с вероятностью ошибки в бите p
+        return decoding_probabilities(self.weight_distribution, p, (self.d_min - 1) // 2)
+ 
     def get_capabilities(self) -> tuple[Any, Any]:
         detect = self.d_min - 1
         correct = (self.d_min - 1) // 2
@@ -173,27 +209,32 @@ class CyclicCode:
         return error3
  
  
-n = 23
-m = 12
-generator_poly = '101011100011'
-code = CyclicCode(n, m, generator_poly)
- 
-print("1. Порождающая матрица G:")
-print(code.G)
- 
-print("\nФрагмент множества кодовых слов (первые 5):")
-for i in range(min(5, len(code.codewords))):
-    print(f"Сообщение {i}: {code.codewords[i]}")
- 
-d_min = code.d_min
-detect, correct = code.get_capabilities()
-print(f"\n2. Характеристики кода:")
-print(f"Минимальное расстояние кода: d_min = {d_min}")
-print(f"Кратность гарантированно обнаруживаемых ошибок: {detect}")
-print(f"Кратность гарантированно исправляемых ошибок: {correct}")
+if __name__ == "__main__":
+    n = 23
+    m = 12
+    generator_poly = '101011100011'
+    code = CyclicCode(n, m, generator_poly)
+ 
+    print("1. Порождающая матрица G:")
+    print(code.G)
+ 
+    print("\nФрагмент множества кодовых слов (первые 5):")
+    for i, codeword in enumerate(code.encode_batch(code.message_bits(np.arange(min(5, 2 ** code.k))))):
+        print(f"Сообщение {i}: {codeword}")
+ 
+    d_min = code.d_min
+    detect, correct = code.get_capabilities()
+    print(f"\n2. Характеристики кода:")
+    print(f"Минимальное расстояние кода: d_min = {d_min}")
+    print(f"Кратность гарантированно обнаруживаемых ошибок: {detect}")
+    print(f"Кратность гарантированно исправляемых ошибок: {correct}")
+    print(f"Весовой спектр: {code.weight_distribution}")
+    probabilities = code.error_probabilities(0.01)
+    print(f"При p = 0.01: необнаруженная ошибка {probabilities['undetected']:.3e}, "
+          f"ошибка декодирования {probabilities['decoder_error']:.3e}, отказ {probabilities['failure']:.3e}")
 
  
-error_example = code.generate_error_examples()
+    error_example = code.generate_error_examples()
  
-print("\n4. Конкретный вектор ошибки, который код может обнаружить, но не может исправить:")
-print(error_example)
\ No newline at end of file
+    print("\n4. Конкретный вектор ошибки, который код может обнаружить, но не может исправить:")
+    print(error_example)
\ No newline at end of file
@@ -0,0 +1,154 @@
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import product
+
+import numpy as np
+
+from gf2 import PolyModulus, int_to_bits, poly_degree, poly_divmod, poly_gcd, poly_mod, poly_mul, poly_mulmod
+from weights import minimum_distance
+
+# Поиск циклических кодов длины n: порождающие многочлены - делители x^n - 1.
+# Многочлены, как и в gf2, хранятся целыми числами (бит i - коэффициент при x^i)
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cyclic_codes_cache.json")
+
+
+def distinct_degree_factorization(f: int) -> list[tuple[int, int]]:
+    # f без кратных множителей. x^(2^d) - x делится на все неприводимые степени,
+    # делящей d, поэтому gcd(f, x^(2^d) - x) - произведение множителей степени d
+    result = []
+    h = 0b10
+    d = 0
+    while poly_degree(f) >= 2 * (d + 1):
+        d += 1
+        h = poly_mulmod(h, h, f)
+        factor = poly_gcd(f, h ^ 0b10)
+        if factor != 1:
+            result.append((factor, d))
+            f = poly_divmod(f, factor)[0]
+            h = poly_mod(h, f)
+    if f != 1:
+        result.append((f, poly_degree(f)))
+    return result
+
+
+def equal_degree_factorization(f: int, d: int, rng: random.Random) -> list[int]:
+    # Все множители f имеют степень d. След a + a^2 + ... + a^(2^(d-1)) по модулю
+    # каждого множителя равен 0 или 1 с вероятностью 1/2, и gcd отщепляет часть из них
+    if poly_degree(f) == d:
+        return [f]
+    while True:
+        a = rng.randrange(2, 1 << poly_degree(f))
+        trace = square = a
+        for _ in range(d - 1):
+            square = poly_mulmod(square, square, f)
+            trace ^= square
+        factor = poly_gcd(f, trace)
+        if 0 < poly_degree(factor) < poly_degree(f):
+            return (equal_degree_factorization(factor, d, rng)
+                    + equal_degree_factorization(poly_divmod(f, factor)[0], d, rng))
+
+
+def factor_xn_minus_1(n: int, seed: int = 0) -> list[tuple[int, int]]:
+    # x^n - 1 = (x^m - 1)^(2^e) при n = 2^e * m, m нечётное; x^m - 1 без кратных множителей
+    e = 0
+    m = n
+    while m % 2 == 0:
+        m //= 2
+        e += 1
+    rng = random.Random(seed)
+    factors = []
+    for f, d in distinct_degree_factorization((1 << m) | 1):
+        factors.extend(equal_degree_factorization(f, d, rng))
+    return [(f, 1 << e) for f in sorted(factors)]
+
+
+def generator_candidates(n: int) -> list[int]:
+    # Все делители x^n - 1, кроме 1 и самого x^n - 1
+    factors = factor_xn_minus_1(n)
+    full = (1 << n) | 1
+    candidates = set()
+    for powers in product(*(range(mult + 1) for _, mult in factors)):
+        g = reduce(poly_mul, (f for (f, _), power in zip(factors, powers) for _ in range(power)), 1)
+        if g != 1 and g != full:
+            candidates.add(g)
+    return sorted(candidates, key=lambda g: (-poly_degree(g), g))
+
+
+def code_parameters(n: int, g: int) -> dict:
+    modulus = PolyModulus(g)
+    r = modulus.r
+    k = n - r
+    G = np.hstack([np.eye(k, dtype=np.uint8),
+                   np.array([int_to_bits(modulus.mod(1 << (n - 1 - i)), r) for i in range(k)], dtype=np.uint8)])
+    return {"n": n, "k": k, "d": minimum_distance(G), "generator_poly": format(g, "b")}
+
+
+def cache_key(n: int, g: int) -> str:
+    return f"{n}:{g:x}"
+
+
+def load_cache(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_cache(cache: dict, path: str) -> None:
+    # Запись через временный файл, чтобы прерванный поиск не испортил кэш
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as file:
+        json.dump(cache, file, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def search_codes(n_values, max_k: int | None = None, workers: int | None = None,
+                 cache_path: str | None = CACHE_PATH) -> list[dict]:
+    cache = load_cache(cache_path) if cache_path else {}
+    tasks = []
+    for n in n_values:
+        for g in generator_candidates(n):
+            if max_k is not None and n - poly_degree(g) > max_k:
+                continue
+            tasks.append((n, g))
+
+    missing = [(n, g) for n, g in tasks if cache_key(n, g) not in cache]
+    if missing:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (n, g), params in zip(missing, pool.map(code_parameters, *zip(*missing), chunksize=8)):
+                cache[cache_key(n, g)] = params
+        if cache_path:
+            save_cache(cache, cache_path)
+
+    return [cache[cache_key(n, g)] for n, g in tasks]
+
+
+def best_codes(results: list[dict]) -> list[dict]:
+    # Для каждой пары (n, k) оставляем код с наибольшим d_min
+    best = {}
+    for params in results:
+        key = params["n"], params["k"]
+        if key not in best or params["d"] > best[key]["d"]:
+            best[key] = params
+    return [best[key] for key in sorted(best)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Поиск циклических кодов по делителям x^n - 1")
+    parser.add_argument("n_min", type=int)
+    parser.add_argument("n_max", type=int, nargs="?")
+    parser.add_argument("--max-k", type=int, default=24)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--all", action="store_true", help="вывести все кандидаты, а не лучшие для каждого k")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    n_values = range(args.n_min, (args.n_max or args.n_min) + 1)
+    results = search_codes(n_values, args.max_k, args.workers, None if args.no_cache else CACHE_PATH)
+    for params in (results if args.all else best_codes(results)):
+        print(f"({params['n']}, {params['k']}, {params['d']}): g = {params['generator_poly']}")
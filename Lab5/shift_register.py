@@ -0,0 +1,124 @@
+import numpy as np
+from abc import ABC, abstractmethod
+from functools import reduce
+from itertools import combinations
+from operator import xor
+from typing import Any
+
+from gf2 import PolyModulus, bits_to_int, int_to_bits, poly_mod, poly_mul
+
+# Декодеры на циклических сдвигах синдрома. Принятое слово - целое число,
+# бит i - коэффициент при x^i. Синдром сдвинутого слова x*r(x) mod (x^n - 1)
+# равен x*s(x) mod g(x), поэтому слово целиком сдвигать не нужно
+
+
+class ShiftRegisterDecoder(ABC):
+    def __init__(self, n: int, generator_poly: str) -> None:
+        g = int(generator_poly, 2)
+        if poly_mod((1 << n) | 1, g):
+            raise ValueError(f"Многочлен {generator_poly} не делит x^{n} - 1")
+        self.n = n
+        self.g = g
+        self.modulus = PolyModulus(g)
+        self.r = self.modulus.r
+
+    def shift_syndrome(self, s: int) -> int:
+        s <<= 1
+        if s >> self.r:
+            s ^= self.g
+        return s
+
+    @abstractmethod
+    def decode(self, word: int) -> tuple[int, bool]:
+        # Возвращает (исправленное слово, удалось ли исправить)
+        ...
+
+    def decode_bits(self, received) -> tuple[bool, np.ndarray[Any, np.dtype[np.uint8]]]:
+        corrected, ok = self.decode(bits_to_int(received))
+        return ok, int_to_bits(corrected, self.n)
+
+
+class MeggittDecoder(ShiftRegisterDecoder):
+    # Таблица хранит только синдромы ошибок веса <= t, задевающих старший
+    # разряд x^(n-1): sum C(n-1, w) для w < t записей, то есть O(n^(t-1)).
+    # Линейна по n она только при t <= 2; для t = 3 уже O(n^2)
+    def __init__(self, n: int, generator_poly: str, t: int) -> None:
+        super().__init__(n, generator_poly)
+        self.t = t
+        self.top_syndrome = self.modulus.mod(1 << (n - 1))
+        unit = [self.modulus.mod(1 << i) for i in range(n - 1)]
+        self.table = {
+            reduce(xor, (unit[i] for i in positions), self.top_syndrome)
+            for w in range(t)
+            for positions in combinations(range(n - 1), w)
+        }
+
+    def decode(self, word: int) -> tuple[int, bool]:
+        s = self.modulus.mod(word)
+        # После j сдвигов старший разряд соответствует позиции n-1-j исходного слова
+        for j in range(self.n):
+            if not s:
+                return word, True
+            if s in self.table:
+                word ^= 1 << (self.n - 1 - j)
+                s ^= self.top_syndrome
+            s = self.shift_syndrome(s)
+        return word, not s
+
+
+class ErrorTrappingDecoder(ShiftRegisterDecoder):
+    # Пакет ошибок длины <= b ловится, когда после сдвигов он попадает в b
+    # младших разрядов: тогда синдром совпадает с самим вектором ошибки
+    def __init__(self, n: int, generator_poly: str, burst_length: int | None = None) -> None:
+        super().__init__(n, generator_poly)
+        self.burst_length = burst_length or self.r // 2
+        if self.burst_length > self.r:
+            raise ValueError("Длина пакета не может превышать n - k")
+        self.mask = (1 << n) - 1
+
+    def decode(self, word: int) -> tuple[int, bool]:
+        s = self.modulus.mod(word)
+        if not s:
+            return word, True
+        limit = 1 << self.burst_length
+        for j in range(self.n):
+            if s < limit:
+                # Ошибка x^(-j) * s(x) mod (x^n - 1): циклический сдвиг вправо на j
+                error = ((s >> j) | (s << (self.n - j))) & self.mask
+                return word ^ error, True
+            s = self.shift_syndrome(s)
+        return word, False
+
+
+def random_codeword(decoder: ShiftRegisterDecoder, rng) -> int:
+    k = decoder.n - decoder.r
+    message = int(rng.integers(0, 2, k) @ (1 << np.arange(k - 1, -1, -1, dtype=object)))
+    shifted = message << decoder.r
+    return shifted | decoder.modulus.mod(shifted)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+
+    # Код Голея (23, 12) исправляет до 3 ошибок
+    golay = MeggittDecoder(23, '101011100011', 3)
+    failures = 0
+    for w in range(1, 4):
+        for positions in combinations(range(23), w):
+            codeword = random_codeword(golay, rng)
+            corrected, ok = golay.decode(codeword ^ reduce(xor, (1 << i for i in positions)))
+            failures += not ok or corrected != codeword
+    print(f"Меггитт, код Голея: записей в таблице {len(golay.table)}, неисправленных ошибок веса <= 3: {failures}")
+
+    # Код Файра (x^9 + 1)(x^5 + x^2 + 1): n = НОК(9, 31) = 279, исправляет пакеты длины <= 5
+    fire = ErrorTrappingDecoder(279, format(poly_mul((1 << 9) | 1, 0b100101), "b"), 5)
+    failures = 0
+    for _ in range(1000):
+        codeword = random_codeword(fire, rng)
+        length = int(rng.integers(1, 6))
+        burst = (1 << (length - 1)) | 1 | int(rng.integers(0, 1 << max(length - 2, 0))) << 1
+        start = int(rng.integers(0, fire.n))
+        error = ((burst << start) | (burst >> (fire.n - start))) & fire.mask
+        corrected, ok = fire.decode(codeword ^ error)
+        failures += not ok or corrected != codeword
+    print(f"Вылавливание ошибок, код Файра (279, {279 - fire.r}): неисправленных пакетов длины <= 5 из 1000: {failures}")
@@ -0,0 +1,101 @@
+import argparse
+import csv
+import math
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from main_1 import CyclicCode
+
+_codes = {}
+
+
+def get_code(params: tuple) -> CyclicCode:
+    # Код строится один раз в каждом процессе пула
+    if params not in _codes:
+        _codes[params] = CyclicCode(*params)
+    return _codes[params]
+
+
+def simulate_batch(params: tuple, p: float, frames: int, seed: int, spawn_key: tuple) -> tuple[int, int]:
+    # Зерно зависит только от (seed, номер p, номер пачки), поэтому результат
+    # не зависит от числа процессов и порядка выполнения
+    code = get_code(params)
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=spawn_key))
+    messages = rng.integers(0, 2, (frames, code.k), dtype=np.uint8)
+    errors = (rng.random((frames, code.n)) < p).astype(np.uint8)
+    _, _, corrected = code.decode_batch(code.encode_batch(messages) ^ errors)
+    # Код систематический: информационные биты идут первыми
+    wrong = corrected[:, :code.k] != messages
+    return int(wrong.sum()), int(wrong.any(axis=1).sum())
+
+
+def wilson_interval(errors: int, trials: int, z: float = 1.96) -> tuple[float, float]:
+    if not trials:
+        return 0.0, 1.0
+    rate = errors / trials
+    denom = 1 + z * z / trials
+    center = (rate + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denom
+    return max(center - half, 0.0), min(center + half, 1.0)
+
+
+def simulate_bsc(code: CyclicCode, p_values, batch_size: int = 100_000, batches_per_round: int = 8,
+                 max_frames: int = 10_000_000, min_frame_errors: int = 100, rel_precision: float = 0.1,
+                 workers: int | None = None, seed: int = 0) -> list[dict]:
+    # Для каждого p пачки считаются раундами; остановка, когда набрано
+    # min_frame_errors ошибочных кадров и полуширина доверительного интервала FER
+    # не больше rel_precision от самой оценки, либо по max_frames
+    params = (code.n, code.k, code.generator_poly)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for pi, p in enumerate(p_values):
+            frames = bit_errors = frame_errors = batch = 0
+            while frames < max_frames:
+                futures = [pool.submit(simulate_batch, params, p, batch_size, seed, (pi, batch + j))
+                           for j in range(batches_per_round)]
+                batch += batches_per_round
+                for future in futures:
+                    bits, frame = future.result()
+                    bit_errors += bits
+                    frame_errors += frame
+                    frames += batch_size
+                low, high = wilson_interval(frame_errors, frames)
+                if frame_errors >= min_frame_errors and (high - low) / 2 <= rel_precision * frame_errors / frames:
+                    break
+            low, high = wilson_interval(frame_errors, frames)
+            results.append({
+                "p": p,
+                "frames": frames,
+                "bit_errors": bit_errors,
+                "frame_errors": frame_errors,
+                "ber": bit_errors / (frames * code.k),
+                "fer": frame_errors / frames,
+                "fer_low": low,
+                "fer_high": high,
+            })
+    return results
+
+
+def save_csv(results: list[dict], path: str) -> None:
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Моделирование кода Голея (23, 12) в двоичном симметричном канале")
+    parser.add_argument("--p", type=float, nargs="+", default=[0.005, 0.01, 0.02, 0.05, 0.1])
+    parser.add_argument("--max-frames", type=int, default=10_000_000)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv")
+    args = parser.parse_args()
+
+    code = CyclicCode(23, 12, '101011100011')
+    results = simulate_bsc(code, args.p, max_frames=args.max_frames, workers=args.workers, seed=args.seed)
+    for r in results:
+        print(f"p = {r['p']:.4f}: BER = {r['ber']:.3e}, FER = {r['fer']:.3e} "
+              f"[{r['fer_low']:.3e}, {r['fer_high']:.3e}], кадров: {r['frames']}")
+    if args.csv:
+        save_csv(results, args.csv)
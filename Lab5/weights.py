@@ -0,0 +1,168 @@
+import numpy as np
+from functools import reduce
+from itertools import combinations
+from math import comb
+from operator import xor
+
+from gf2 import bits_to_int
+
+# Кодовые слова упакованы в целые числа: строка G -> int, сложение -> XOR, вес -> bit_count
+
+
+def generator_rows(G) -> list[int]:
+    return [bits_to_int(row) for row in G]
+
+
+def gray_code_weights(rows: list[int], n: int) -> list[int]:
+    # Обход всех 2^k кодовых слов кодом Грея: на каждом шаге один XOR строки G
+    distribution = [0] * (n + 1)
+    distribution[0] = 1
+    codeword = 0
+    for i in range(1, 1 << len(rows)):
+        codeword ^= rows[(i & -i).bit_length() - 1]
+        distribution[codeword.bit_count()] += 1
+    return distribution
+
+
+def information_sets(G) -> list[list[int]]:
+    # Систематические формы G на попарно непересекающихся информационных множествах
+    G = np.array(G, dtype=np.uint8) % 2
+    k, n = G.shape
+    used = set()
+    matrices = []
+    while True:
+        M = G.copy()
+        row = 0
+        pivots = []
+        for col in range(n):
+            if col in used:
+                continue
+            candidates = np.nonzero(M[row:, col])[0]
+            if not candidates.size:
+                continue
+            pivot = row + candidates[0]
+            M[[row, pivot]] = M[[pivot, row]]
+            others = np.nonzero(M[:, col])[0]
+            others = others[others != row]
+            M[others] ^= M[row]
+            pivots.append(col)
+            row += 1
+            if row == k:
+                break
+        if row < k:
+            return matrices
+        matrices.append(generator_rows(M))
+        used.update(pivots)
+
+
+def brouwer_zimmermann(G) -> int:
+    # Перебираем сообщения веса w в каждой из m систематических форм.
+    # Любое ещё не перебранное слово имеет вес >= w + 1 на каждом из m
+    # непересекающихся информационных множеств, то есть не меньше m * (w + 1)
+    G = np.asarray(G)
+    k = G.shape[0]
+    matrices = information_sets(G)
+    upper = min(row.bit_count() for row in generator_rows(G))
+    if not matrices:
+        return upper
+    for w in range(1, k + 1):
+        for rows in matrices:
+            for combo in combinations(rows, w):
+                upper = min(upper, reduce(xor, combo).bit_count())
+        if len(matrices) * (w + 1) >= upper:
+            break
+    return upper
+
+
+def minimum_distance(G, exhaustive_limit: int = 16) -> int:
+    # Код линейный, поэтому d_min равно минимальному весу ненулевого слова
+    G = np.asarray(G)
+    k, n = G.shape
+    if k <= exhaustive_limit:
+        distribution = gray_code_weights(generator_rows(G), n)
+        return next((w for w in range(1, n + 1) if distribution[w]), n)
+    return brouwer_zimmermann(G)
+
+
+def dual_rows(G) -> list[int]:
+    # Базис ортогонального кода: приводим G к ступенчатому виду, каждая свободная
+    # позиция f даёт слово с единицей в f и M[i, f] на позиции i-го ведущего столбца
+    M = np.array(G, dtype=np.uint8) % 2
+    k, n = M.shape
+    pivots = []
+    row = 0
+    for col in range(n):
+        if row == k:
+            break
+        candidates = np.nonzero(M[row:, col])[0]
+        if not candidates.size:
+            continue
+        pivot = row + candidates[0]
+        M[[row, pivot]] = M[[pivot, row]]
+        others = np.nonzero(M[:, col])[0]
+        others = others[others != row]
+        M[others] ^= M[row]
+        pivots.append(col)
+        row += 1
+    rows = []
+    for f in range(n):
+        if f in pivots:
+            continue
+        h = np.zeros(n, dtype=np.uint8)
+        h[f] = 1
+        h[pivots] = M[:len(pivots), f]
+        rows.append(bits_to_int(h))
+    return rows
+
+
+def krawtchouk(n: int) -> list[list[int]]:
+    # K[j][i] = sum_s (-1)^s C(i, s) C(n - i, j - s)
+    return [[sum((-1) ** s * comb(i, s) * comb(n - i, j - s) for s in range(min(i, j) + 1))
+             for i in range(n + 1)] for j in range(n + 1)]
+
+
+def macwilliams(dual_distribution: list[int], n: int) -> list[int]:
+    # Тождество Мак-Вильямс: A_j = (1 / |C^|) * sum_i B_i K_j(i), всё в целых числах
+    size = sum(dual_distribution)
+    K = krawtchouk(n)
+    return [sum(b * K[j][i] for i, b in enumerate(dual_distribution) if b) // size for j in range(n + 1)]
+
+
+def weight_distribution(G) -> list[int]:
+    # Перебираем 2^k слов кода или 2^(n-k) слов ортогонального кода - что меньше
+    G = np.asarray(G)
+    k, n = G.shape
+    if k <= n - k:
+        return gray_code_weights(generator_rows(G), n)
+    return macwilliams(gray_code_weights(dual_rows(G), n), n)
+
+
+def undetected_error_probability(distribution: list[int], p: float) -> float:
+    # Ошибка не обнаруживается, если вектор ошибки сам является ненулевым кодовым словом
+    n = len(distribution) - 1
+    return sum(a * p ** w * (1 - p) ** (n - w) for w, a in enumerate(distribution) if w and a)
+
+
+def decoding_probabilities(distribution: list[int], p: float, t: int) -> dict:
+    # Декодер исправляет ровно ошибки веса <= t. Ошибка декодирования - принятое
+    # слово попало в шар радиуса t вокруг другого кодового слова веса j:
+    # слов на расстоянии s от него с весом ошибки j - s + 2u ровно C(j, s - u) C(n - j, u)
+    n = len(distribution) - 1
+    q = 1 - p
+    correct = sum(comb(n, w) * p ** w * q ** (n - w) for w in range(t + 1))
+    wrong = 0.0
+    for j, a in enumerate(distribution):
+        if not j or not a:
+            continue
+        for s in range(t + 1):
+            for u in range(s + 1):
+                if s - u > j or u > n - j:
+                    continue
+                e = j - s + 2 * u
+                wrong += a * comb(j, s - u) * comb(n - j, u) * p ** e * q ** (n - e)
+    return {
+        "correct": correct,
+        "undetected": undetected_error_probability(distribution, p),
+        "decoder_error": wrong,
+        "failure": max(1 - correct - wrong, 0.0),
+    }
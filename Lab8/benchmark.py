@@ -0,0 +1,157 @@
+import argparse
+import csv
+import json
+import time
+
+import numpy as np
+
+from main import MaxFlow
+from min_cost_flow import MinCostFlow
+
+# Генераторы сетей возвращают (число вершин, начала, концы, пропускные способности, исток, сток)
+
+
+def random_network(n: int, rng) -> tuple:
+    # Разреженный случайный орграф, в среднем 8 дуг из вершины
+    m = 8 * n
+    return n, rng.integers(0, n, m), rng.integers(0, n, m), rng.integers(100, 1000, m), 0, n - 1
+
+
+def dense_network(n: int, rng) -> tuple:
+    # Почти полный орграф, как в эксперименте со случайной матрицей из main.py
+    n = max(int(n ** 0.5) * 4, 2)
+    matrix = rng.integers(100, 1000, (n, n)) * (rng.random((n, n)) < 0.5)
+    np.fill_diagonal(matrix, 0)
+    tails, heads = np.nonzero(matrix)
+    return n, tails, heads, matrix[tails, heads], 0, n - 1
+
+
+def layered_network(n: int, rng) -> tuple:
+    # Слои ширины ~sqrt(n), каждая вершина соединена с 4 случайными вершинами следующего слоя
+    width = max(int(n ** 0.5), 2)
+    layers = max(n // width, 2)
+    s, t = layers * width, layers * width + 1
+    tails = [np.full(width, s), np.arange(width) + (layers - 1) * width]
+    heads = [np.arange(width), np.full(width, t)]
+    for layer in range(layers - 1):
+        tails.append(np.repeat(np.arange(width), 4) + layer * width)
+        heads.append(rng.integers(0, width, 4 * width) + (layer + 1) * width)
+    tails, heads = np.concatenate(tails), np.concatenate(heads)
+    return layers * width + 2, tails, heads, rng.integers(100, 1000, len(tails)), s, t
+
+
+def grid_network(n: int, rng) -> tuple:
+    # Решётка side x side с дугами в обе стороны, исток и сток - противоположные углы
+    side = max(int(n ** 0.5), 2)
+    ids = np.arange(side * side).reshape(side, side)
+    pairs = [(ids[:, :-1], ids[:, 1:]), (ids[:-1, :], ids[1:, :])]
+    tails = np.concatenate([np.concatenate([a.ravel(), b.ravel()]) for a, b in pairs])
+    heads = np.concatenate([np.concatenate([b.ravel(), a.ravel()]) for a, b in pairs])
+    return side * side, tails, heads, rng.integers(100, 1000, len(tails)), 0, side * side - 1
+
+
+FAMILIES = {
+    "random": random_network,
+    "dense": dense_network,
+    "layered": layered_network,
+    "grid": grid_network,
+}
+
+METHODS = ("dinic", "push_relabel")
+
+# Поток минимальной стоимости делает по Дейкстре на каждую различную длину
+# кратчайшего пути (сотни раундов на layered), поэтому по умолчанию сети меньше
+SIZES = [1000, 10000]
+MIN_COST_SIZES = [300, 1000]
+
+
+def run_case(family: str, n: int, seed: int = 0) -> list[dict]:
+    size, tails, heads, caps, s, t = FAMILIES[family](n, np.random.default_rng(seed))
+    results = []
+    for method in METHODS:
+        # Каждый метод получает свежую сеть; время построения CSR не учитывается
+        mf = MaxFlow.from_edges(size, tails, heads, caps)
+        mf.build()
+        start = time.perf_counter()
+        flow = mf.max_flow(s, t, method=method)
+        results.append({
+            "family": family,
+            "vertices": size,
+            "edges": len(tails),
+            "method": method,
+            "flow": flow,
+            "seconds": time.perf_counter() - start,
+            "stats": mf.stats,
+        })
+    if results[0]["flow"] != results[1]["flow"]:
+        raise ValueError(f"Методы дали разный поток на сети {family}, n = {n}")
+    return results
+
+
+def run_min_cost_case(family: str, n: int, seed: int = 0) -> list[dict]:
+    # Та же сеть со случайными стоимостями [1, 100]: обычный поток против потока
+    # минимальной стоимости; величины потоков должны совпасть
+    size, tails, heads, caps, s, t = FAMILIES[family](n, np.random.default_rng(seed))
+    costs = np.random.default_rng(seed + 1).integers(1, 100, len(tails))
+    results = []
+    for method in ("dinic", "min_cost"):
+        if method == "dinic":
+            mf = MaxFlow.from_edges(size, tails, heads, caps)
+            mf.build()
+            start = time.perf_counter()
+            flow, cost = mf.max_flow(s, t), None
+        else:
+            mf = MinCostFlow.from_edges(size, tails, heads, caps, costs)
+            mf.build()
+            start = time.perf_counter()
+            flow, cost = mf.min_cost_flow(s, t)
+        results.append({
+            "family": family,
+            "vertices": size,
+            "edges": len(tails),
+            "method": method,
+            "flow": flow,
+            "cost": cost,
+            "seconds": time.perf_counter() - start,
+            "stats": mf.stats,
+        })
+    if results[0]["flow"] != results[1]["flow"]:
+        raise ValueError(f"Поток минимальной стоимости не максимален на сети {family}, n = {n}")
+    return results
+
+
+def run_benchmark(families: list, sizes: list, seed: int = 0, min_cost: bool = False) -> list[dict]:
+    case = run_min_cost_case if min_cost else run_case
+    return [r for family in families for n in sizes for r in case(family, n, seed)]
+
+
+def save_results(results: list[dict], json_path: str | None = None, csv_path: str | None = None) -> None:
+    if json_path:
+        with open(json_path, "w") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+    if csv_path and results:
+        rows = [{key: value for key, value in r.items() if key != "stats"} for r in results]
+        with open(csv_path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сравнение алгоритмов Диница и проталкивания предпотока")
+    parser.add_argument("--min-cost", action="store_true", help="сравнить Диница с потоком минимальной стоимости")
+    parser.add_argument("--families", nargs="+", choices=list(FAMILIES), default=list(FAMILIES))
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        help=f"по умолчанию {SIZES}, с --min-cost {MIN_COST_SIZES}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json")
+    parser.add_argument("--csv")
+    args = parser.parse_args()
+
+    sizes = args.sizes or (MIN_COST_SIZES if args.min_cost else SIZES)
+    results = run_benchmark(args.families, sizes, args.seed, args.min_cost)
+    for r in results:
+        cost = f", стоимость {r['cost']}" if r.get("cost") is not None else ""
+        print(f"{r['family']:>8} V = {r['vertices']:>7} E = {r['edges']:>8} {r['method']:>12}: "
+              f"поток {r['flow']}{cost}, {r['seconds']:.3f} с")
+    save_results(results, args.json, args.csv)
@@ -0,0 +1,151 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from main import MaxFlow
+
+# Дерево Гомори-Ху неориентированной сети по алгоритму Гасфилда: n - 1 поиск
+# потока на исходном графе без стягивания вершин. Ребро (v, parent[v]) с весом
+# weight[v] - минимальный разрез между v и parent[v], а поддерево v - одна из его сторон.
+# Неориентированное ребро задаётся двумя встречными дугами одной пропускной способности
+
+_graph = None
+
+
+def undirected_flow(size, tails, heads, caps) -> MaxFlow:
+    tails, heads = np.asarray(tails), np.asarray(heads)
+    return MaxFlow.from_edges(size, np.concatenate([tails, heads]), np.concatenate([heads, tails]),
+                              np.concatenate([caps, caps]))
+
+
+def init_worker(size, tails, heads, caps, method) -> None:
+    global _graph
+    _graph = (size, tails, heads, caps, method)
+
+
+def cut_task(s, t) -> tuple[int, int, object, bytes]:
+    # Каждый поиск идёт на свежей копии сети; сторона разреза возвращается упакованной
+    size, tails, heads, caps, method = _graph
+    mf = undirected_flow(size, tails, heads, caps)
+    value = mf.max_flow(s, t, method=method)
+    return s, t, value, np.packbits(mf.source_side(s)).tobytes()
+
+
+class GomoryHuTree:
+    def __init__(self, size, tails, heads, caps, parent, weight) -> None:
+        self.size = size
+        self.tails = np.asarray(tails)
+        self.heads = np.asarray(heads)
+        self.caps = np.asarray(caps)
+        self.parent = parent
+        self.weight = weight
+        # Глубины для подъёма к общему предку; корень дерева - вершина 0
+        self.children = [[] for _ in range(size)]
+        for v in range(1, size):
+            self.children[parent[v]].append(v)
+        self.depth = [0] * size
+        stack = [0]
+        while stack:
+            v = stack.pop()
+            for u in self.children[v]:
+                self.depth[u] = self.depth[v] + 1
+                stack.append(u)
+
+    def path_min_edge(self, u, v) -> int:
+        # Вершина x с наименьшим weight[x] на пути u - v, ребро дерева (x, parent[x])
+        if u == v:
+            raise ValueError("Вершины разреза должны различаться")
+        best = None
+        while u != v:
+            if self.depth[u] < self.depth[v]:
+                u, v = v, u
+            if best is None or self.weight[u] < self.weight[best]:
+                best = u
+            u = self.parent[u]
+        return best
+
+    def min_cut_value(self, u, v) -> object:
+        return self.weight[self.path_min_edge(u, v)]
+
+    def subtree(self, x) -> np.ndarray:
+        side = np.zeros(self.size, dtype=bool)
+        stack = [x]
+        while stack:
+            v = stack.pop()
+            side[v] = True
+            stack.extend(self.children[v])
+        return side
+
+    def min_cut(self, u, v) -> tuple[object, np.ndarray, list[tuple]]:
+        # Значение разреза, маска стороны u и рёбра исходной сети, пересекающие разрез
+        x = self.path_min_edge(u, v)
+        side = self.subtree(x)
+        if not side[u]:
+            side = ~side
+        crossing = side[self.tails] != side[self.heads]
+        edges = list(zip(self.tails[crossing].tolist(), self.heads[crossing].tolist()))
+        return self.weight[x], side, edges
+
+
+def gomory_hu_tree(size, tails, heads, caps, workers=None, batch_size=None, method="dinic") -> GomoryHuTree:
+    # Вершины обрабатываются по порядку, но разрезы для следующих batch_size вершин
+    # считаются в пуле заранее для текущих parent. Результат принимается, если к моменту
+    # обработки parent[s] не изменился; иначе разрез пересчитывается в следующей пачке
+    tails = np.asarray(tails, dtype=np.int64)
+    heads = np.asarray(heads, dtype=np.int64)
+    caps = np.asarray(caps)
+    parent = np.zeros(size, dtype=np.int64)
+    weight = [0] * size
+    batch_size = batch_size or 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(size, tails, heads, caps, method)) as pool:
+        s = 1
+        while s < size:
+            batch = list(range(s, min(s + batch_size, size)))
+            results = {r[0]: r for r in pool.map(cut_task, batch, [int(parent[v]) for v in batch])}
+            for v in batch:
+                t = parent[v]
+                if results[v][1] != t:
+                    # Предсказание не сбылось: всё начиная с v считается заново
+                    break
+                _, _, value, packed = results[v]
+                side = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=size).astype(bool)
+                weight[v] = value
+                moved = side & (parent == t)
+                moved[v] = False
+                parent[moved] = v
+                if side[parent[t]]:
+                    parent[v] = parent[t]
+                    parent[t] = v
+                    weight[v] = weight[t]
+                    weight[t] = value
+                s = v + 1
+    return GomoryHuTree(size, tails, heads, caps, parent.tolist(), weight)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Дерево Гомори-Ху для случайной неориентированной сети")
+    parser.add_argument("--vertices", type=int, default=200)
+    parser.add_argument("--degree", type=int, default=6)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    n = args.vertices
+    m = n * args.degree // 2
+    tails, heads = rng.integers(0, n, m), rng.integers(0, n, m)
+    keep = tails != heads
+    tails, heads = tails[keep], heads[keep]
+    caps = rng.integers(100, 1000, len(tails))
+
+    tree = gomory_hu_tree(n, tails, heads, caps, workers=args.workers)
+    print(f"Дерево Гомори-Ху: {n} вершин, {len(tails)} рёбер")
+    for _ in range(5):
+        u, v = (int(x) for x in rng.choice(n, 2, replace=False))
+        value, side, edges = tree.min_cut(u, v)
+        direct = undirected_flow(n, tails, heads, caps).max_flow(u, v)
+        print(f"{u} - {v}: разрез {value} (прямой расчёт {direct}), "
+              f"сторона {u}: {int(side.sum())} вершин, рёбер в разрезе: {len(edges)}")
@@ -1,95 +1,508 @@
 import numpy as np
+from array import array
 from collections import deque
 from typing import Any, Literal
 
 
-class Edge:
-    def __init__(self, to, rev, capacity) -> None:
-        self.to = to
-        self.rev = rev
-        self.capacity = capacity
+def to_array(typecode, values) -> array:
+    # Копия массива numpy в array без промежуточного объекта bytes
+    result = array(typecode)
+    result.frombytes(memoryview(np.ascontiguousarray(values)).cast('B'))
+    return result
 
 
 class MaxFlow:
+    # Остаточная сеть в формате CSR: дуги вершины v занимают позиции
+    # start[v]..start[v+1]-1 массивов to/rev/cap, rev[a] - индекс обратной дуги.
+    # Новые рёбра копятся в плоских массивах tails/heads/caps и раскладываются
+    # в CSR одним проходом numpy при первом запуске алгоритма, после чего эти
+    # массивы очищаются: у каждого ребра своя обратная дуга, поэтому начало, конец
+    # и пропускная способность ребра e восстанавливаются по дуге a = pos[e]:
+    # to[rev[a]], to[a] и cap[a] + cap[rev[a]]. Индексы хранятся 32-битными ('i')
     def __init__(self, size) -> None:
         assert size > 0
         self.size = size
-        self.graph = [[] for _ in range(self.size)]
+        self.tails = array('i')
+        self.heads = array('i')
+        self.caps = array('q')
+        self.cap = array('q')
+        self.pos = array('i')
+        self.built = False
+        # Пара (исток, сток) последнего решения и величина потока между ними
+        self.terminals = None
+        self.value = 0
 
-    def add_edge(self, fr, to, cap) -> None:
-        forward = Edge(to, len(self.graph[to]), cap)
-        backward = Edge(fr, len(self.graph[fr]), 0)
-        self.graph[fr].append(forward)
-        self.graph[to].append(backward)
+    def add_edge(self, fr, to, cap) -> int:
+        if isinstance(cap, float) and self.caps.typecode == 'q':
+            self.caps = array('d', self.caps)
+            self.cap = array('d', self.cap)
+        self.tails.append(fr)
+        self.heads.append(to)
+        self.caps.append(cap)
+        self.built = False
+        return len(self.pos) + len(self.tails) - 1
 
-    def bfs_level(self, s, level) -> None:
+    @classmethod
+    def from_edges(cls, size, tails, heads, caps) -> "MaxFlow":
+        mf = cls(size)
+        caps = np.asarray(caps)
+        mf.tails = array('i', np.asarray(tails, dtype=np.int32).tobytes())
+        mf.heads = array('i', np.asarray(heads, dtype=np.int32).tobytes())
+        if np.issubdtype(caps.dtype, np.floating):
+            mf.caps = array('d', caps.astype(np.float64).tobytes())
+        else:
+            mf.caps = array('q', caps.astype(np.int64).tobytes())
+        return mf
+
+    @classmethod
+    def from_matrix(cls, matrix) -> "MaxFlow":
+        matrix = np.asarray(matrix)
+        tails, heads = np.nonzero(matrix > 0)
+        return cls.from_edges(len(matrix), tails, heads, matrix[tails, heads])
+
+    def arc_dtype(self) -> type:
+        return np.float64 if self.caps.typecode == 'd' else np.int64
+
+    def edge_arcs(self) -> tuple[np.ndarray, np.ndarray]:
+        # Прямая и обратная дуга каждого ребра, уже разложенного в CSR
+        pos = np.frombuffer(self.pos, dtype=np.int32) if len(self.pos) else np.zeros(0, dtype=np.int32)
+        rev = np.frombuffer(self.rev, dtype=np.int32) if len(self.pos) else np.zeros(0, dtype=np.int32)
+        return pos, rev[pos]
+
+    def edge_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Начала, концы и пропускные способности рёбер: сначала разложенные в CSR,
+        # затем ещё не разложенные
+        forward, backward = self.edge_arcs()
+        dtype = self.arc_dtype()
+        to = np.frombuffer(self.to, dtype=np.int32) if len(forward) else np.zeros(0, dtype=np.int32)
+        cap = np.frombuffer(self.cap, dtype=dtype) if len(forward) else np.zeros(0, dtype=dtype)
+        pending = len(self.tails)
+        tails = np.frombuffer(self.tails, dtype=np.int32) if pending else np.zeros(0, dtype=np.int32)
+        heads = np.frombuffer(self.heads, dtype=np.int32) if pending else np.zeros(0, dtype=np.int32)
+        caps = np.frombuffer(self.caps, dtype=dtype) if pending else np.zeros(0, dtype=dtype)
+        return (np.concatenate([to[backward], tails]), np.concatenate([to[forward], heads]),
+                np.concatenate([cap[forward] + cap[backward], caps]))
+
+    def edge_flows(self) -> np.ndarray:
+        # Поток по ребру равен остатку его обратной дуги
+        _, backward = self.edge_arcs()
+        if not len(backward):
+            return np.zeros(0, dtype=self.arc_dtype())
+        return np.frombuffer(self.cap, dtype=self.arc_dtype())[backward]
+
+    def net_flow(self, t) -> Any:
+        forward, backward = self.edge_arcs()
+        if not len(forward):
+            return 0
+        to = np.frombuffer(self.to, dtype=np.int32)
+        flows = self.edge_flows()
+        return (flows[to[forward] == t].sum() - flows[to[backward] == t].sum()).item()
+
+    def build(self) -> None:
+        # Ребро i даёт прямую дугу i и обратную дугу m + i; после устойчивой
+        # сортировки по началу дуги pos[j] - новое место дуги j.
+        # Поток по уже существовавшим рёбрам переносится в новую раскладку.
+        # Временные массивы 32-битные и копируются в array без промежуточных bytes
+        flows = self.edge_flows()
+        tails, heads, caps = self.edge_arrays()
+        typecode = self.caps.typecode
+        self.tails = array('i')
+        self.heads = array('i')
+        self.caps = array(typecode)
+        m = len(tails)
+        arc_tails = np.concatenate([tails, heads])
+        order = np.argsort(arc_tails, kind="stable").astype(np.int32)
+        counts = np.bincount(arc_tails, minlength=self.size)
+        del arc_tails
+        pos = np.empty(2 * m, dtype=np.int32)
+        pos[order] = np.arange(2 * m, dtype=np.int32)
+        arc_caps = np.concatenate([caps, np.zeros(m, dtype=caps.dtype)])
+        arc_caps[:len(flows)] -= flows
+        arc_caps[m:m + len(flows)] += flows
+        del caps, flows
+
+        self.start = to_array('i', np.concatenate([[0], np.cumsum(counts)]).astype(np.int32))
+        self.to = to_array('i', np.concatenate([heads, tails])[order])
+        del tails, heads
+        # Обратная к дуге j - дуга j + m (по модулю 2m)
+        partner = order + m
+        partner[partner >= 2 * m] -= 2 * m
+        self.rev = to_array('i', pos[partner])
+        del partner
+        self.cap = to_array(typecode, arc_caps[order])
+        # Индекс прямой дуги для каждого ребра
+        self.pos = to_array('i', pos[:m])
+        self.built = True
+
+    def bfs_level(self, s, level, t=None) -> None:
+        # Обход можно прервать, как только найден сток: все ещё не помеченные
+        # вершины лежат не ближе стока и в блокирующий поток не попадут
+        start, to, cap = self.start, self.to, self.cap
         q = deque()
         level[:] = [-1] * self.size
         level[s] = 0
         q.append(s)
         while q:
             v = q.popleft()
-            for edge in self.graph[v]:
-                if edge.capacity > 0 and level[edge.to] < 0:
-                    level[edge.to] = level[v] + 1
-                    q.append(edge.to)
-
-    def dfs_flow(self, v, t, upTo, iter_, level) -> Any | Literal[0]:
-        if v == t:
-            return upTo
-        for i in range(iter_[v], len(self.graph[v])):
-            edge = self.graph[v][i]
-            if edge.capacity > 0 and level[v] < level[edge.to]:
-                d = self.dfs_flow(edge.to, t, min(upTo, edge.capacity), iter_, level)
-                if d > 0:
-                    edge.capacity -= d
-                    self.graph[edge.to][edge.rev].capacity += d
-                    return d
-            iter_[v] += 1
-        return 0
-
-    def max_flow(self, s, t) -> Any | Literal[0]:
+            for a in range(start[v], start[v + 1]):
+                if cap[a] > 0 and level[to[a]] < 0:
+                    level[to[a]] = level[v] + 1
+                    if to[a] == t:
+                        return
+                    q.append(to[a])
+
+    def blocking_flow(self, s, t, level) -> Any | Literal[0]:
+        # Итеративный поиск блокирующего потока по слоистой сети. После насыщения
+        # пути откатываемся только до первой насыщенной дуги и продолжаем оттуда,
+        # поэтому за фазу проталкивается много путей без повторного спуска от s.
+        # Тупиковые вершины вычёркиваются из слоистой сети (level = -1)
+        start, to, rev, cap = self.start, self.to, self.rev, self.cap
+        iter_ = list(start[:-1])
+        path = []
+        vertices = [s]
+        v = s
+        pushed = 0
+        while True:
+            if v == t:
+                d = min(cap[a] for a in path)
+                first = len(path)
+                for i, a in enumerate(path):
+                    cap[a] -= d
+                    cap[rev[a]] += d
+                    if not cap[a] and i < first:
+                        first = i
+                pushed += d
+                self.stats["augmentations"] += 1
+                del path[first:]
+                del vertices[first + 1:]
+                v = vertices[-1]
+                continue
+            end = start[v + 1]
+            a = iter_[v]
+            next_level = level[v] + 1
+            while a < end and not (cap[a] > 0 and level[to[a]] == next_level):
+                a += 1
+            iter_[v] = a
+            if a < end:
+                path.append(a)
+                v = to[a]
+                vertices.append(v)
+            else:
+                level[v] = -1
+                if not path:
+                    return pushed
+                path.pop()
+                vertices.pop()
+                v = vertices[-1]
+                iter_[v] += 1
+
+    def dinic(self, s, t, callback=None) -> Any | Literal[0]:
+        # callback(stats) вызывается после каждой фазы: номер фазы, текущий поток,
+        # число найденных путей
+        self.stats = {"phases": 0, "augmentations": 0, "flow": 0}
         flow = 0
         level = [-1] * self.size
         while True:
-            self.bfs_level(s, level)
+            self.bfs_level(s, level, t)
             if level[t] < 0:
                 break
-            iter_ = [0] * self.size
+            flow += self.blocking_flow(s, t, level)
+            self.stats["phases"] += 1
+            self.stats["flow"] = flow
+            if callback is not None:
+                callback(self.stats)
+        return flow
+
+    def distance_labels(self, sink, blocked) -> list[int]:
+        # Точные высоты: расстояние до стока по остаточным дугам (обход в ширину
+        # по обратным дугам). Недостижимые вершины и blocked получают высоту n
+        n = self.size
+        start, to, rev, cap = self.start, self.to, self.rev, self.cap
+        height = [n] * n
+        height[sink] = 0
+        q = deque([sink])
+        while q:
+            v = q.popleft()
+            for b in range(start[v], start[v + 1]):
+                u = to[b]
+                if height[u] == n and u != blocked and cap[rev[b]] > 0:
+                    height[u] = height[v] + 1
+                    q.append(u)
+        return height
+
+    def push_relabel_phase(self, sink, blocked, excess, gap) -> None:
+        # Проталкивание из вершины с наибольшей высотой. Активны вершины с избытком
+        # и высотой < n; каждые n подъёмов высоты пересчитываются обходом от стока
+        n = self.size
+        start, to, rev, cap = self.start, self.to, self.rev, self.cap
+        stats = self.stats
+        height = count = buckets = current = None
+        highest = relabels = 0
+
+        def relabel_all() -> None:
+            nonlocal height, count, buckets, current, highest, relabels
+            height = self.distance_labels(sink, blocked)
+            count = [0] * (n + 1)
+            for h in height:
+                count[h] += 1
+            buckets = [[] for _ in range(n)]
+            for v in range(n):
+                if excess[v] > 0 and height[v] < n and v != sink and v != blocked:
+                    buckets[height[v]].append(v)
+            current = list(start[:-1])
+            highest = n - 1
+            relabels = 0
+            stats["global_relabels"] += 1
+
+        relabel_all()
+        while highest >= 0:
+            bucket = buckets[highest]
+            if not bucket:
+                highest -= 1
+                continue
+            v = bucket.pop()
+            if height[v] != highest or excess[v] <= 0:
+                continue
             while True:
-                f = self.dfs_flow(s, t, float('inf'), iter_, level)
-                if f == 0:
+                a, end = current[v], start[v + 1]
+                lower = height[v] - 1
+                while a < end:
+                    if cap[a] > 0 and height[to[a]] == lower:
+                        u = to[a]
+                        d = excess[v] if excess[v] < cap[a] else cap[a]
+                        cap[a] -= d
+                        cap[rev[a]] += d
+                        if not excess[u] and u != sink and u != blocked:
+                            buckets[lower].append(u)
+                        excess[u] += d
+                        excess[v] -= d
+                        stats["pushes"] += 1
+                        if not excess[v]:
+                            break
+                    a += 1
+                current[v] = a
+                if not excess[v]:
                     break
-                flow += f
-                print("current flow: ", flow)
-            level = [-1] * self.size
-        return flow
 
-    def min_cut(self, s, t) -> list[tuple]:
+                # Подъём: на единицу выше самого низкого соседа по остаточной дуге
+                old = height[v]
+                new = min((height[to[b]] for b in range(start[v], end) if cap[b] > 0), default=n - 1) + 1
+                stats["relabels"] += 1
+                relabels += 1
+                count[old] -= 1
+                if gap and not count[old] and old < n:
+                    # Разрыв: вершины выше old больше не достигают стока
+                    stats["gaps"] += 1
+                    for u in range(n):
+                        if old < height[u] < n:
+                            count[height[u]] -= 1
+                            height[u] = n
+                            count[n] += 1
+                    height[v] = n
+                    count[n] += 1
+                    break
+                height[v] = min(new, n)
+                count[height[v]] += 1
+                current[v] = start[v]
+                if height[v] >= n:
+                    break
+                if relabels >= n:
+                    relabel_all()
+                    if height[v] < n:
+                        buckets[height[v]].append(v)
+                    break
+                if height[v] > highest:
+                    highest = height[v]
+
+    def push_relabel(self, s, t, callback=None) -> Any | Literal[0]:
+        # Фаза 1 строит максимальный предпоток, фаза 2 возвращает избытки
+        # в исток (сток фазы 1 заблокирован), после чего остаточная сеть снова
+        # соответствует допустимому потоку и min_cut работает как после Диница
+        start, to, rev, cap = self.start, self.to, self.rev, self.cap
+        self.stats = {"pushes": 0, "relabels": 0, "global_relabels": 0, "gaps": 0, "flow": 0}
+        excess = [0] * self.size
+        for a in range(start[s], start[s + 1]):
+            d = cap[a]
+            if d > 0:
+                cap[a] = 0
+                cap[rev[a]] += d
+                excess[to[a]] += d
+                excess[s] -= d
+        self.push_relabel_phase(t, s, excess, gap=True)
+        self.stats["flow"] = excess[t]
+        if callback is not None:
+            callback(self.stats)
+        self.push_relabel_phase(s, t, excess, gap=False)
+        return excess[t]
+
+    def max_flow(self, s, t, callback=None, method="dinic") -> Any | Literal[0]:
+        # Для той же пары (s, t) поток наращивается от текущего остаточного графа;
+        # возвращается прирост, полная величина потока хранится в self.value.
+        # Поток, оставшийся от другой пары, не является допустимым s-t потоком
+        # (у бывших терминалов нарушен баланс), поэтому он сбрасывается
+        if not self.built:
+            self.build()
+        if (s, t) != self.terminals:
+            self.reset_flow()
+            self.terminals = (s, t)
+        if method == "dinic":
+            pushed = self.dinic(s, t, callback)
+        elif method == "push_relabel":
+            pushed = self.push_relabel(s, t, callback)
+        else:
+            raise ValueError(f"Неизвестный метод поиска потока: {method}")
+        self.value += pushed
+        return pushed
+
+    def reset_flow(self) -> None:
+        # Поток с обратной дуги каждого ребра возвращается на прямую
+        forward, backward = self.edge_arcs()
+        if len(forward):
+            cap = np.frombuffer(self.cap, dtype=self.arc_dtype())
+            cap[forward] += cap[backward]
+            cap[backward] = 0
+        self.terminals = None
+        self.value = 0
+
+    def augment(self, x, y, limit) -> Any | Literal[0]:
+        # Проталкивает до limit единиц из x в y по остаточным путям. Поиск идёт
+        # в ширину с двух сторон (из x по дугам, из y по обратным дугам), каждый раз
+        # расширяется меньший фронт, поэтому неудачный поиск стоит столько,
+        # сколько меньшая из двух областей, а не весь граф
+        if x == y:
+            return limit
+        start, to, rev, cap = self.start, self.to, self.rev, self.cap
+        pushed = 0
+        while pushed < limit:
+            forward, backward = {x: -1}, {y: -1}
+            front, back = [x], [y]
+            meet = None
+            while front and back and meet is None:
+                grow = []
+                if len(front) <= len(back):
+                    for v in front:
+                        for a in range(start[v], start[v + 1]):
+                            u = to[a]
+                            if cap[a] > 0 and u not in forward:
+                                forward[u] = a
+                                if u in backward:
+                                    meet = u
+                                    break
+                                grow.append(u)
+                        if meet is not None:
+                            break
+                    front = grow
+                else:
+                    for v in back:
+                        for b in range(start[v], start[v + 1]):
+                            u = to[b]
+                            if cap[rev[b]] > 0 and u not in backward:
+                                backward[u] = rev[b]
+                                if u in forward:
+                                    meet = u
+                                    break
+                                grow.append(u)
+                        if meet is not None:
+                            break
+                    back = grow
+            if meet is None:
+                break
+            path = []
+            v = meet
+            while v != x:
+                a = forward[v]
+                path.append(a)
+                v = to[rev[a]]
+            v = meet
+            while v != y:
+                a = backward[v]
+                path.append(a)
+                v = to[a]
+            d = min(limit - pushed, min(cap[a] for a in path))
+            for a in path:
+                cap[a] -= d
+                cap[rev[a]] += d
+            pushed += d
+        return pushed
+
+    def update_capacities(self, updates, method="augment") -> Any:
+        # updates: {номер ребра: новая пропускная способность}. Если поток по ребру
+        # больше новой пропускной способности, лишний поток r сначала пускается
+        # в обход ребра, а остаток возвращается: избыток из начала ребра - в исток,
+        # недостача в конце ребра покрывается из стока. Затем поток доращивается
+        # от получившегося остаточного графа: по умолчанию отдельными путями
+        # (для небольших изменений), либо методом max_flow ("dinic", "push_relabel").
+        # Если ни одна пропускная способность не выросла и поток не уменьшился,
+        # он остаётся максимальным и доращивать нечего
+        if self.terminals is None:
+            raise ValueError("Сначала нужно найти максимальный поток (max_flow)")
+        s, t = self.terminals
+        if not self.built:
+            self.build()
+        value = self.value
+        grown = False
+        for e, c in dict(updates).items():
+            if c < 0:
+                raise ValueError("Пропускная способность не может быть отрицательной")
+            if isinstance(c, float) and self.caps.typecode == 'q':
+                self.caps = array('d', self.caps)
+                self.cap = array('d', self.cap)
+            cap = self.cap
+            a = self.pos[e]
+            b = self.rev[a]
+            f = cap[b]
+            grown = grown or c > cap[a] + f
+            if c >= f:
+                cap[a] = c - f
+                continue
+            cap[a] = 0
+            cap[b] = c
+            r = f - c
+            u, v = self.to[b], self.to[a]
+            self.value += (r if u == t else 0) - (r if v == t else 0)
+            surplus = r if u != s and u != t else 0
+            deficit = r if v != s and v != t else 0
+            if surplus and deficit:
+                moved = self.augment(u, v, min(surplus, deficit))
+                surplus -= moved
+                deficit -= moved
+            if surplus:
+                surplus -= self.augment(u, s, surplus)
+                self.value += self.augment(u, t, surplus)
+            if deficit:
+                moved = self.augment(t, v, deficit)
+                self.value -= moved
+                self.augment(s, v, deficit - moved)
+        if grown or self.value < value:
+            if method == "augment":
+                self.value += self.augment(s, t, float('inf'))
+            else:
+                self.max_flow(s, t, method=method)
+        return self.value
+
+    def source_side(self, s) -> list[bool]:
         # Находим достижимые вершины из истока в остаточном графе
+        if not self.built:
+            self.build()
+        start, to, cap = self.start, self.to, self.cap
         visited = [False] * self.size
         q = deque()
         q.append(s)
         visited[s] = True
         while q:
             v = q.popleft()
-            for edge in self.graph[v]:
-                if edge.capacity > 0 and not visited[edge.to]:
-                    visited[edge.to] = True
-                    q.append(edge.to)
-
-        # Находим рёбра минимального разреза
-        cut_edges = []
-        for i in range(self.size):
-            if visited[i]:
-                for edge in self.graph[i]:
-                    if not visited[edge.to] and edge.capacity == 0:
-                        if edge.to < len(self.graph) and edge.rev < len(self.graph[edge.to]):
-                            rev_edge = self.graph[edge.to][edge.rev]
-                            if rev_edge.capacity > 0:
-                                cut_edges.append((i, edge.to))
+            for a in range(start[v], start[v + 1]):
+                if cap[a] > 0 and not visited[to[a]]:
+                    visited[to[a]] = True
+                    q.append(to[a])
+        return visited
 
-        return cut_edges
+    def min_cut(self, s, t) -> list[tuple]:
+        visited = np.array(self.source_side(s))
+        # Рёбра минимального разреза - исходные рёбра из достижимой части в недостижимую
+        tails, heads, caps = self.edge_arrays()
+        cut = (caps > 0) & visited[tails] & ~visited[heads]
+        return list(zip(tails[cut].tolist(), heads[cut].tolist()))
 
 
 def solve_problem(adj_matrix, description) -> None:
@@ -98,13 +511,7 @@ def solve_problem(adj_matrix, description) -> None:
     for row in adj_matrix:
         print(row)
 
-    N = len(adj_matrix)
-    mf = MaxFlow(N)
-
-    for i in range(N):
-        for j in range(N):
-            if adj_matrix[i][j] > 0:
-                mf.add_edge(i, j, adj_matrix[i][j])
+    mf = MaxFlow.from_matrix(adj_matrix)
 
     source = 0
     sink = 2
@@ -0,0 +1,179 @@
+import heapq
+import numpy as np
+from array import array
+from collections import deque
+from typing import Any
+
+from main import MaxFlow
+
+# Поток минимальной стоимости на той же CSR-сети, что и MaxFlow: у каждой дуги
+# есть стоимость cost[a], у обратной дуги стоимость с противоположным знаком
+
+
+class MinCostFlow(MaxFlow):
+    def __init__(self, size) -> None:
+        super().__init__(size)
+        self.costs = array('q')
+
+    def add_edge(self, fr, to, cap, cost=0) -> int:
+        if isinstance(cost, float) and self.costs.typecode == 'q':
+            self.costs = array('d', self.costs)
+        self.costs.append(cost)
+        return super().add_edge(fr, to, cap)
+
+    @classmethod
+    def from_edges(cls, size, tails, heads, caps, costs=None) -> "MinCostFlow":
+        mf = super().from_edges(size, tails, heads, caps)
+        costs = np.zeros(len(mf.tails), dtype=np.int64) if costs is None else np.asarray(costs)
+        if np.issubdtype(costs.dtype, np.floating):
+            mf.costs = array('d', costs.astype(np.float64).tobytes())
+        else:
+            mf.costs = array('q', costs.astype(np.int64).tobytes())
+        return mf
+
+    def build(self) -> None:
+        super().build()
+        dtype = np.float64 if self.costs.typecode == 'd' else np.int64
+        costs = np.frombuffer(self.costs, dtype=dtype)
+        pos = np.frombuffer(self.pos, dtype=np.int32)
+        arc_costs = np.zeros(len(self.to), dtype=dtype)
+        arc_costs[pos] = costs
+        arc_costs[np.frombuffer(self.rev, dtype=np.int32)[pos]] = -costs
+        self.cost = array(self.costs.typecode, arc_costs.tobytes())
+
+    def initial_potentials(self, s) -> list:
+        # Если у какой-то остаточной дуги отрицательная стоимость (отрицательное ребро
+        # или обратная дуга ребра, по которому уже идёт поток), потенциалы -
+        # кратчайшие расстояния от s (Беллман-Форд с очередью); иначе все нулевые
+        cap_view = np.frombuffer(self.cap, dtype=self.arc_dtype())
+        cost_view = np.frombuffer(self.cost, dtype=np.float64 if self.cost.typecode == 'd' else np.int64)
+        if not ((cap_view > 0) & (cost_view < 0)).any():
+            return [0] * self.size
+        start, to, cap, cost = self.start, self.to, self.cap, self.cost
+        dist = [float('inf')] * self.size
+        dist[s] = 0
+        in_queue = [False] * self.size
+        q = deque([s])
+        in_queue[s] = True
+        relaxed = 0
+        while q:
+            v = q.popleft()
+            in_queue[v] = False
+            for a in range(start[v], start[v + 1]):
+                u = to[a]
+                if cap[a] > 0 and dist[v] + cost[a] < dist[u]:
+                    dist[u] = dist[v] + cost[a]
+                    if not in_queue[u]:
+                        relaxed += 1
+                        if relaxed > self.size * len(self.to):
+                            raise ValueError("В сети есть цикл отрицательной стоимости")
+                        in_queue[u] = True
+                        q.append(u)
+        return [d if d != float('inf') else 0 for d in dist]
+
+    def min_cost_flow(self, s, t, limit=float('inf'), callback=None) -> tuple[Any, Any]:
+        # Прямо-двойственный метод последовательных кратчайших путей. Дейкстра идёт
+        # по приведённым стоимостям cost[a] + h[v] - h[u] >= 0 с потенциалами Джонсона h
+        # и останавливается на стоке, после чего h[v] += min(dist[v], dist[t]).
+        # Общий сдвиг всех h на dist[t] приведённые стоимости не меняет, поэтому
+        # достаточно поправить только пройденные вершины: h[v] += dist[v] - dist[t].
+        # Затем по дугам нулевой приведённой стоимости (это ровно все кратчайшие пути)
+        # проталкивается блокирующий поток Диница, а не один путь на каждую Дейкстру
+        # Повторный вызов для той же пары (s, t) продолжает с текущего потока
+        # (так поток можно набирать частями через limit); поток другой пары
+        # сбрасывается, как в MaxFlow.max_flow
+        if not self.built:
+            self.build()
+        if (s, t) != self.terminals:
+            self.reset_flow()
+            self.terminals = (s, t)
+        start, to, cap, cost = self.start, self.to, self.cap, self.cost
+        n = self.size
+        inf = float('inf')
+        h = self.initial_potentials(s)
+        dtype = self.arc_dtype()
+        cap_view = np.frombuffer(cap, dtype=dtype)
+        cost_view = np.frombuffer(cost, dtype=np.float64 if cost.typecode == 'd' else np.int64)
+        arc_tails = np.repeat(np.arange(self.size), np.diff(np.frombuffer(start, dtype=np.int32)))
+        arc_heads = np.frombuffer(to, dtype=np.int32)
+        eps = 1e-9 if cost.typecode == 'd' else 0
+        self.stats = {"augmentations": 0, "dijkstra": 0, "flow": 0, "cost": 0}
+        flow = total_cost = 0
+        level = [-1] * self.size
+        push, pop = heapq.heappush, heapq.heappop
+        while flow < limit:
+            dist = [inf] * n
+            dist[s] = 0
+            done = bytearray(n)
+            visited = []
+            heap = [(0, s)]
+            while heap:
+                d, v = pop(heap)
+                if done[v]:
+                    continue
+                done[v] = 1
+                visited.append(v)
+                if v == t:
+                    break
+                hv = h[v] + d
+                # Приведённые стоимости неотрицательны, поэтому у пройденной вершины
+                # dist не больше nd и отдельная проверка done не нужна
+                for a in range(start[v], start[v + 1]):
+                    if cap[a] > 0:
+                        u = to[a]
+                        nd = hv + cost[a] - h[u]
+                        if nd < dist[u]:
+                            dist[u] = nd
+                            push(heap, (nd, u))
+            self.stats["dijkstra"] += 1
+            if not done[t]:
+                break
+            dt = dist[t]
+            for v in visited:
+                h[v] += dist[v] - dt
+
+            # Дуги с положительной приведённой стоимостью временно закрываются
+            potentials = np.array(h)
+            hidden = (cap_view > 0) & (cost_view + potentials[arc_tails] - potentials[arc_heads] > eps)
+            saved = cap_view[hidden]
+            cap_view[hidden] = 0
+            if limit == inf:
+                pushed = 0
+                while True:
+                    self.bfs_level(s, level, t)
+                    if level[t] < 0:
+                        break
+                    pushed += self.blocking_flow(s, t, level)
+            else:
+                pushed = self.augment(s, t, limit - flow)
+            cap_view[hidden] = saved
+
+            flow += pushed
+            total_cost += pushed * (h[t] - h[s])
+            self.stats["flow"] = flow
+            self.stats["cost"] = total_cost
+            if callback is not None:
+                callback(self.stats)
+        self.value += flow
+        return flow, total_cost
+
+
+if __name__ == "__main__":
+    # Поток, набранный частями через limit, должен стоить столько же, сколько
+    # поток, найденный за один вызов: во втором вызове у обратных дуг уже
+    # отрицательные стоимости, и потенциалы считаются Беллманом-Фордом
+    edges = [(0, 3, 2, 57), (3, 2, 2, 34), (2, 1, 2, 48), (3, 1, 4, 18), (3, 1, 1, 3), (2, 3, 2, 32),
+             (3, 1, 4, 61), (3, 1, 4, 69), (0, 2, 4, 16), (0, 2, 5, 57), (0, 3, 2, 20), (2, 1, 1, 69),
+             (3, 0, 3, 96), (0, 2, 3, 28), (2, 1, 2, 56), (1, 2, 2, 86)]
+    tails, heads, caps, costs = zip(*edges)
+
+    whole = MinCostFlow.from_edges(4, tails, heads, caps, costs)
+    flow, cost = whole.min_cost_flow(0, 1)
+    print(f"За один вызов: поток {flow}, стоимость {cost}")
+
+    split = MinCostFlow.from_edges(4, tails, heads, caps, costs)
+    first = split.min_cost_flow(0, 1, limit=7)
+    second = split.min_cost_flow(0, 1)
+    print(f"Частями: поток {first[0]} + {second[0]}, стоимость {first[1]} + {second[1]} = {first[1] + second[1]}")
+    if (first[0] + second[0], first[1] + second[1]) != (flow, cost):
+        raise ValueError("Поток, набранный частями, не совпал с потоком за один вызов")
@@ -1,5 +1,6 @@
 import networkx as nx
 import matplotlib.pyplot as plt
+import numpy as np
 from typing import Literal, Mapping
 
 # Проверка двудольности
@@ -66,6 +67,142 @@ def kuhn_matching(graph: nx.Graph, left, right) -> list[tuple[int, int]]:
     return matching
 
 
+# Хопкрофт-Карп: вершины долей перенумерованы целыми числами, смежность хранится
+# в формате CSR: соседи u - adj[start[u]:start[u + 1]], по возрастанию их степени
+def bipartite_adjacency(n: int, n_other: int, us, vs) -> tuple[list[int], list[int]]:
+    us = np.asarray(us, dtype=np.int64)
+    vs = np.asarray(vs, dtype=np.int64)
+    order = np.lexsort((np.bincount(vs, minlength=n_other)[vs], us))
+    start = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(us, minlength=n), out=start[1:])
+    return start.tolist(), vs[order].tolist()
+
+
+def hopcroft_karp(n_left: int, n_right: int, us, vs) -> list[int]:
+    # Рёбра (us[i], vs[i]); возвращает match_left: пару каждой левой вершины или -1
+    start, adj = bipartite_adjacency(n_left, n_right, us, vs)
+    rstart, radj = bipartite_adjacency(n_right, n_left, vs, us)
+    match_left = [-1] * n_left
+    match_right = [-1] * n_right
+
+    # Жадное начальное паросочетание: вершины берутся по возрастанию степени,
+    # каждая занимает свободного соседа наименьшей степени
+    for u in np.argsort(np.diff(start), kind="stable").tolist():
+        for i in range(start[u], start[u + 1]):
+            v = adj[i]
+            if match_right[v] < 0:
+                match_left[u] = v
+                match_right[v] = u
+                break
+
+    free = [u for u in range(n_left) if match_left[u] < 0 and start[u + 1] > start[u]]
+    while free:
+        # Двусторонний обход в ширину по чередующимся путям: fdist - расстояние от
+        # свободных левых вершин, rdist - до свободной правой (в левых вершинах).
+        # Расширяется слой с меньшим числом рёбер; на встрече двух обходов слой
+        # дорабатывается до конца, и best - длина кратчайшего увеличивающего пути
+        fdist = [-1] * n_left
+        rdist = [-1] * n_left
+        for u in free:
+            fdist[u] = 0
+        forward = free
+        backward = [v for v in range(n_right) if match_right[v] < 0 and rstart[v + 1] > rstart[v]]
+        forward_edges = sum(start[u + 1] - start[u] for u in forward)
+        backward_edges = sum(rstart[v + 1] - rstart[v] for v in backward)
+        a = 0
+        b = -1
+        best = -1
+        while best < 0 and forward and backward:
+            layer = []
+            if forward_edges <= backward_edges:
+                for u in forward:
+                    for i in range(start[u], start[u + 1]):
+                        w = match_right[adj[i]]
+                        if w < 0:
+                            if best < 0 or a < best:
+                                best = a
+                        elif fdist[w] < 0:
+                            fdist[w] = a + 1
+                            layer.append(w)
+                            if rdist[w] >= 0 and (best < 0 or a + 1 + rdist[w] < best):
+                                best = a + 1 + rdist[w]
+                forward = layer
+                forward_edges = sum(start[u + 1] - start[u] for u in layer)
+                a += 1
+            else:
+                for v in backward:
+                    for i in range(rstart[v], rstart[v + 1]):
+                        u = radj[i]
+                        if rdist[u] < 0 and match_left[u] != v:
+                            rdist[u] = b + 1
+                            if match_left[u] >= 0:
+                                layer.append(match_left[u])
+                            if fdist[u] >= 0 and (best < 0 or fdist[u] + b + 1 < best):
+                                best = fdist[u] + b + 1
+                backward = layer
+                backward_edges = sum(rstart[v + 1] - rstart[v] for v in layer)
+                b += 1
+        if best < 0:
+            break
+        a = min(a, best)
+
+        # Итеративный поиск в глубину по кратчайшим путям: стек левых вершин, it[u] -
+        # текущее ребро. Вершина на позиции p <= a должна иметь fdist = p, дальше -
+        # rdist = best - p. Тупиковые вершины выбывают до конца фазы
+        it = start[:-1]
+        for root in free:
+            stack = [root]
+            while stack:
+                u = stack[-1]
+                p = len(stack)
+                end = start[u + 1]
+                i = it[u]
+                found = pushed = False
+                while i < end:
+                    w = match_right[adj[i]]
+                    if w < 0:
+                        found = True
+                        break
+                    if (fdist[w] == p) if p <= a else (rdist[w] == best - p >= 0):
+                        pushed = True
+                        break
+                    i += 1
+                it[u] = i
+                if found:
+                    # Чередующийся путь: каждая вершина стека берёт своё текущее ребро
+                    for x in stack:
+                        v = adj[it[x]]
+                        match_left[x] = v
+                        match_right[v] = x
+                    break
+                if pushed:
+                    stack.append(w)
+                else:
+                    fdist[u] = rdist[u] = -1
+                    stack.pop()
+                    if stack:
+                        it[stack[-1]] += 1
+        free = [u for u in free if match_left[u] < 0]
+    return match_left
+
+
+def hopcroft_karp_matching(graph: nx.Graph, left, right) -> list[tuple[int, int]]:
+    left_nodes = list(left)
+    right_nodes = list(right)
+    left_index = {node: i for i, node in enumerate(left_nodes)}
+    right_index = {node: i for i, node in enumerate(right_nodes)}
+    us, vs = [], []
+    for u, v in graph.edges():
+        if u in left_index and v in right_index:
+            us.append(left_index[u])
+            vs.append(right_index[v])
+        elif v in left_index and u in right_index:
+            us.append(left_index[v])
+            vs.append(right_index[u])
+    match = hopcroft_karp(len(left_nodes), len(right_nodes), us, vs)
+    return [(left_nodes[u], right_nodes[v]) for u, v in enumerate(match) if v >= 0]
+
+
 def visualize_graph(graph: nx.Graph, left, right, matching: list[tuple[int, int]], title: str) -> None:
     plt.figure(figsize=(12, 8))
     pos = {}
@@ -128,6 +265,7 @@ if __name__ == "__main__":
 
     ff_matching = ford_fulkerson_matching(graph, left, right)
     k_matching = kuhn_matching(graph, left, right)
+    hk_matching = hopcroft_karp_matching(graph, left, right)
 
     print()
     print("Наибольшее паросочетание (Форд-Фалкерсон):")
@@ -139,5 +277,10 @@ if __name__ == "__main__":
     print(k_matching)
     print(f"Размер: {len(k_matching)}")
 
+    print()
+    print("Наибольшее паросочетание (Хопкрофт-Карп):")
+    print(hk_matching)
+    print(f"Размер: {len(hk_matching)}")
+
     visualize_graph(graph, left, right, ff_matching, "Наибольшее паросочетание (Форд-Фалкерсон)")
     visualize_graph(graph, left, right, k_matching, "Наибольшее паросочетание (Кун)")
\ No newline at end of file